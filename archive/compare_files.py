@@ -3,40 +3,202 @@
 Compare original and processed data files to verify calculations
 """
 
+import os
+from itertools import zip_longest
+import numpy as np
 import pandas as pd
-from decimal import Decimal
-import json
 
-def load_file(file_path: str) -> pd.DataFrame:
-    """Load CSV file and clean numeric columns"""
-    df = pd.read_csv(file_path)
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+NUMERIC_COLUMNS = ['taxable_amount', 'gst', 'cgst', 'sgst', 'cess', 'total_amount']
+COMPARE_COLUMNS = ['jpin'] + NUMERIC_COLUMNS
+
+# Files above this size are compared chunk by chunk instead of fully loaded
+CHUNK_THRESHOLD_BYTES = 200 * 1024 * 1024
+CHUNK_SIZE = 200_000
+SAMPLE_SIZE = 5
+
+def load_columns(file_path: str) -> list:
+    """Read only the header row and return cleaned column names"""
+    return [col.strip().lower() for col in pd.read_csv(file_path, nrows=0).columns]
+
+def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce numeric columns the parser left as text because of stray junk"""
+    for col in df.columns:
+        # Columns the parser already made numeric need no cleanup
+        if col.strip().lower() in NUMERIC_COLUMNS and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col].str.replace(',', '', regex=False), errors='coerce')
+    return df
+
+def _cache_path(file_path: str) -> str:
+    return f'{file_path}.parquet'
+
+def _load_cached(file_path: str, usecols: list = None):
+    """Return the parquet-cached frame if it is newer than the CSV, else None"""
+    cache_path = _cache_path(file_path)
+    if pq is None or not os.path.exists(cache_path):
+        return None
+    if os.path.getmtime(cache_path) < os.path.getmtime(file_path):
+        return None
+    
+    try:
+        # Serve the cache only if it holds every requested column the CSV has
+        wanted = load_columns(file_path)
+        if usecols is not None:
+            wanted = [col for col in wanted if col in set(usecols)]
+        if not set(wanted).issubset(pq.read_schema(cache_path).names):
+            return None
+        return pd.read_parquet(cache_path, engine='pyarrow', columns=wanted)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable cache {cache_path}: {e}")
+        return None
+
+def load_file(file_path: str, usecols: list = None, use_cache: bool = True) -> pd.DataFrame:
+    """Load CSV file with numeric columns parsed directly by the C reader"""
+    if use_cache:
+        cached = _load_cached(file_path, usecols)
+        if cached is not None:
+            return cached
+    
+    # Headers in the query dumps can carry stray whitespace/casing, so key
+    # the dtype map and column selection on the raw header names
+    header = pd.read_csv(file_path, nrows=0).columns
+    if usecols is not None:
+        wanted = set(usecols)
+        header = [col for col in header if col.strip().lower() in wanted]
+        usecols = header
+    dtype = {col: 'float64' for col in header if col.strip().lower() in NUMERIC_COLUMNS}
+    
+    try:
+        # thousands=',' strips separators inside the parser, no post-hoc cleanup
+        df = pd.read_csv(file_path, usecols=usecols, dtype=dtype, thousands=',',
+                         engine='c', low_memory=False, cache_dates=True)
+    except ValueError:
+        # Non-numeric junk in a numeric column - parse leniently instead
+        df = _coerce_numeric(pd.read_csv(file_path, usecols=usecols, thousands=',',
+                                         engine='c', low_memory=False))
     
     # Clean column names
     df.columns = [col.strip().lower() for col in df.columns]
     
-    # Clean numeric columns
-    numeric_columns = ['taxable_amount', 'gst', 'cgst', 'sgst', 'cess', 'total_amount']
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
+    if use_cache and pq is not None:
+        try:
+            df.to_parquet(_cache_path(file_path), engine='pyarrow', compression='snappy', index=False)
+        except Exception as e:
+            print(f"⚠️ Could not write cache for {file_path}: {e}")
     
     return df
 
+def iter_chunks(file_path: str, usecols: list, chunksize: int = CHUNK_SIZE):
+    """Yield cleaned CSV chunks so large dumps never sit fully in memory"""
+    wanted = set(usecols)
+    header = [col for col in pd.read_csv(file_path, nrows=0).columns if col.strip().lower() in wanted]
+    
+    with pd.read_csv(file_path, usecols=header, thousands=',', engine='c',
+                     chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk = _coerce_numeric(chunk)
+            chunk.columns = [col.strip().lower() for col in chunk.columns]
+            yield chunk
+
+def summarize_block(original: pd.DataFrame, processed: pd.DataFrame, numeric_cols: list,
+                    sample_size: int = SAMPLE_SIZE):
+    """
+    Column sums and sample differing rows for two position-aligned frames
+    
+    Returns:
+        (original_sums, processed_sums, samples) where samples holds, per
+        column, up to sample_size (jpin, original, processed, difference) tuples
+    """
+    # One pass over the whole (rows x cols) numeric block instead of
+    # per-column scans; rows are aligned by position like the index join was
+    original_block = original[numeric_cols].to_numpy(dtype=np.float64)
+    processed_block = processed[numeric_cols].to_numpy(dtype=np.float64)
+    common_rows = min(len(original_block), len(processed_block))
+    diffs = original_block[:common_rows] - processed_block[:common_rows]
+    diff_masks = np.abs(diffs) > 0.01
+    jpins = original['jpin'].to_numpy()
+    
+    samples = []
+    for col_idx in range(len(numeric_cols)):
+        sample_rows = np.flatnonzero(diff_masks[:, col_idx])[:sample_size]
+        samples.append([
+            (jpins[row], original_block[row, col_idx], processed_block[row, col_idx], diffs[row, col_idx])
+            for row in sample_rows
+        ])
+    
+    return np.nansum(original_block, axis=0), np.nansum(processed_block, axis=0), samples
+
+def summarize_chunked(original_path: str, processed_path: str, numeric_cols: list,
+                      chunksize: int = CHUNK_SIZE):
+    """
+    Stream both files in lockstep chunks and reduce them incrementally
+    
+    Both readers use the same chunk size, so chunk N of each file covers the
+    same row positions.
+    
+    Returns:
+        (original_rows, processed_rows, original_sums, processed_sums, samples)
+    """
+    original_rows = processed_rows = 0
+    original_sums = np.zeros(len(numeric_cols))
+    processed_sums = np.zeros(len(numeric_cols))
+    samples = [[] for _ in numeric_cols]
+    
+    # Stand-ins once the shorter file runs out of chunks
+    empty_original = pd.DataFrame(columns=['jpin'] + numeric_cols)
+    empty_processed = pd.DataFrame(columns=numeric_cols)
+    
+    for original, processed in zip_longest(
+            iter_chunks(original_path, ['jpin'] + numeric_cols, chunksize),
+            iter_chunks(processed_path, numeric_cols, chunksize)):
+        original = empty_original if original is None else original
+        processed = empty_processed if processed is None else processed
+        original_rows += len(original)
+        processed_rows += len(processed)
+        
+        chunk_original_sums, chunk_processed_sums, chunk_samples = summarize_block(
+            original, processed, numeric_cols)
+        original_sums += chunk_original_sums
+        processed_sums += chunk_processed_sums
+        for col_samples, chunk_col_samples in zip(samples, chunk_samples):
+            col_samples.extend(chunk_col_samples[:SAMPLE_SIZE - len(col_samples)])
+    
+    return original_rows, processed_rows, original_sums, processed_sums, samples
+
 def compare_files():
     """Compare original and processed files"""
     print("🔍 Comparing files...")
     
-    # Load both files
-    original = load_file('input_data/Mys-V1 - Paste Query Data Over Here.csv')
-    processed = load_file('input_data/processed_data.csv')
+    original_path = 'input_data/Mys-V1 - Paste Query Data Over Here.csv'
+    processed_path = 'input_data/processed_data.csv'
+    
+    original_cols = load_columns(original_path)
+    processed_cols = load_columns(processed_path)
+    numeric_cols = [col for col in ['taxable_amount', 'gst', 'cgst', 'sgst', 'cess']
+                    if col in original_cols and col in processed_cols]
+    
+    if max(os.path.getsize(original_path), os.path.getsize(processed_path)) > CHUNK_THRESHOLD_BYTES:
+        print("📦 Large input - comparing in chunks")
+        original_rows, processed_rows, original_sums, processed_sums, samples = summarize_chunked(
+            original_path, processed_path, numeric_cols)
+    else:
+        # Load both files - only the key and numeric columns are compared
+        original = load_file(original_path, usecols=COMPARE_COLUMNS)
+        processed = load_file(processed_path, usecols=COMPARE_COLUMNS)
+        original_rows, processed_rows = len(original), len(processed)
+        original_sums, processed_sums, samples = summarize_block(original, processed, numeric_cols)
     
     print("\n=== Basic Comparison ===")
-    print(f"Original rows: {len(original)}")
-    print(f"Processed rows: {len(processed)}")
+    print(f"Original rows: {original_rows}")
+    print(f"Processed rows: {processed_rows}")
     
     # Compare columns
-    original_cols = set(original.columns)
-    processed_cols = set(processed.columns)
+    original_cols = set(original_cols)
+    processed_cols = set(processed_cols)
     
     print("\n=== Column Comparison ===")
     print("Original columns:", sorted(original_cols))
@@ -46,33 +208,27 @@ def compare_files():
     
     # Compare key numeric columns
     print("\n=== Value Comparison ===")
-    numeric_cols = ['taxable_amount', 'gst', 'cgst', 'sgst', 'cess']
     
-    for col in numeric_cols:
-        if col in original.columns and col in processed.columns:
-            print(f"\n{col.upper()} Comparison:")
-            original_sum = original[col].sum()
-            processed_sum = processed[col].sum()
-            
-            print(f"Original sum: {original_sum:,.2f}")
-            print(f"Processed sum: {processed_sum:,.2f}")
+    for col_idx, col in enumerate(numeric_cols):
+        print(f"\n{col.upper()} Comparison:")
+        original_sum = original_sums[col_idx]
+        processed_sum = processed_sums[col_idx]
+        
+        print(f"Original sum: {original_sum:,.2f}")
+        print(f"Processed sum: {processed_sum:,.2f}")
+        
+        if abs(original_sum - processed_sum) < 0.01:
+            print("✅ Values match")
+        else:
+            print(f"❌ Difference: {abs(original_sum - processed_sum):,.2f}")
             
-            if abs(original_sum - processed_sum) < 0.01:
-                print("✅ Values match")
-            else:
-                print(f"❌ Difference: {abs(original_sum - processed_sum):,.2f}")
-                
-                # Show sample of differences
-                diff_mask = abs(original[col] - processed[col]) > 0.01
-                if diff_mask.any():
-                    print("\nSample differences:")
-                    diff_df = pd.DataFrame({
-                        'JPIN': original.loc[diff_mask, 'jpin'],
-                        'Original': original.loc[diff_mask, col],
-                        'Processed': processed.loc[diff_mask, col],
-                        'Difference': original.loc[diff_mask, col] - processed.loc[diff_mask, col]
-                    }).head()
-                    print(diff_df.to_string())
+            # Show sample of differences
+            if samples[col_idx]:
+                print("\nSample differences:")
+                print(f"{'JPIN':>12} {'Original':>14} {'Processed':>14} {'Difference':>14}")
+                for jpin, original_value, processed_value, difference in samples[col_idx]:
+                    print(f"{jpin!s:>12} {original_value:>14,.2f} "
+                          f"{processed_value:>14,.2f} {difference:>14,.2f}")
 
 if __name__ == "__main__":
     compare_files() 
\ No newline at end of file
@@ -5,86 +5,116 @@ Reads an existing Excel DC file and converts it to PDF format
 """
 
 import os
+import re
 import sys
 from datetime import datetime
-from decimal import Decimal
-import pandas as pd
-from openpyxl import load_workbook
-from src.pdf_generator.dc_pdf_generator import create_dc_pdf_from_excel_data
+
+# Hub companies recognised in the sender name; anything else is SourcingBee
+_HUB_TYPE_PATTERN = re.compile(r'amolakchand|bodega', re.IGNORECASE)
+_HUB_TYPES = {'amolakchand': 'AMOLAKCHAND', 'bodega': 'BODEGA'}
+
+def classify_hub_type(sender_name):
+    """Map a sender name to its hub type with a single regex scan"""
+    match = _HUB_TYPE_PATTERN.search(sender_name or '')
+    return _HUB_TYPES[match.group(0).lower()] if match else 'SOURCINGBEE'
+
+def iter_product_rows(ws):
+    """
+    Yield (description, hsn, qty, value, gst_rate, cess_amount) for each product
+    row from row 14 down to the Total row
+    """
+    max_row = ws.max_row
+    if max_row is not None and max_row < 14:
+        # Some writers report a bogus A1:A1 dimension; scan until the Total row
+        ws.reset_dimensions()
+        max_row = None
+    
+    for s_no, description, hsn, qty, value, gst_rate, _, _, cess_amt in ws.iter_rows(
+            min_row=14, max_row=max_row, max_col=9, values_only=True):
+        # Stop if we hit the "Total" row or if s_no is None/empty
+        if not s_no:
+            return
+        if isinstance(s_no, str) and s_no.strip().lower() == "total":
+            return
+        
+        yield description, hsn, qty or 0, value or 0, gst_rate or 0, cess_amt or 0
 
 def read_excel_dc_data(excel_path):
     """
     Read DC data from an existing Excel file
     """
+    # Heavy imports deferred so the CLI's early-exit paths stay instant
+    import numpy as np
+    from openpyxl import load_workbook
+    
     try:
         print(f"📖 Reading Excel file: {excel_path}")
         
-        # Load the workbook
-        wb = load_workbook(excel_path)
-        ws = wb.active
-        
-        # Extract basic information from the Excel file
-        dc_data = {}
-        
-        # Read header information
-        dc_data['serial_number'] = ws['C3'].value or 'Unknown'
-        
-        # Parse date
-        date_str = ws['C4'].value
-        if isinstance(date_str, str):
-            try:
-                dc_data['date'] = datetime.strptime(date_str, '%d-%b-%Y')
-            except:
-                dc_data['date'] = datetime.now()
-        else:
-            dc_data['date'] = date_str or datetime.now()
-        
-        dc_data['vehicle_number'] = ws['I4'].value or 'Unknown'
-        
-        # Read party information
-        dc_data['sender_name'] = ws['B8'].value or 'Unknown Sender'
-        dc_data['receiver_name'] = ws['F8'].value or 'Unknown Receiver'
-        dc_data['hub_address'] = ws['F9'].value or 'Unknown Address'
-        
-        # Determine hub type from sender name
-        sender_name = dc_data['sender_name'].lower()
-        if 'amolakchand' in sender_name:
-            dc_data['hub_type'] = 'AMOLAKCHAND'
-        elif 'bodega' in sender_name:
-            dc_data['hub_type'] = 'BODEGA'
-        else:
-            dc_data['hub_type'] = 'SOURCINGBEE'
-        
-        # Read product data starting from row 14
-        products = []
-        row = 14
-        
-        while True:
-            # Check if we've reached the totals row or end of data
-            s_no = ws.cell(row=row, column=1).value
+        # Load the workbook read-only: cell values only, no style objects
+        wb = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            
+            # Header block (rows 1-13, columns A-I) as plain value tuples
+            header = list(ws.iter_rows(min_row=1, max_row=13, max_col=9, values_only=True))
+            
+            def header_value(row, col):
+                return header[row - 1][col - 1] if row <= len(header) else None
+            
+            # Extract basic information from the Excel file
+            dc_data = {}
+            
+            # Read header information
+            dc_data['serial_number'] = header_value(3, 3) or 'Unknown'
             
-            # Stop if we hit the "Total" row or if s_no is None/empty
-            if not s_no:
-                break
-            if isinstance(s_no, str) and s_no.strip().lower() == "total":
-                break
-                
-            product = {
-                'Description': ws.cell(row=row, column=2).value or 'Unknown Product',
-                'HSN': ws.cell(row=row, column=3).value or 'Unknown',
-                'Quantity': Decimal(str(ws.cell(row=row, column=4).value or 0)),
-                'Value': Decimal(str(ws.cell(row=row, column=5).value or 0)),
-                'GST Rate': Decimal(str(ws.cell(row=row, column=6).value or 0)),
-                'Cess': Decimal(str(ws.cell(row=row, column=9).value or 0)) * Decimal('100') / Decimal(str(ws.cell(row=row, column=5).value or 1))  # Convert CESS amount back to rate
-            }
+            # Parse date
+            date_str = header_value(4, 3)
+            if isinstance(date_str, str):
+                try:
+                    dc_data['date'] = datetime.strptime(date_str, '%d-%b-%Y')
+                except:
+                    dc_data['date'] = datetime.now()
+            else:
+                dc_data['date'] = date_str or datetime.now()
             
-            products.append(product)
-            row += 1
+            dc_data['vehicle_number'] = header_value(4, 9) or 'Unknown'
             
-            # Safety check to avoid infinite loop - increased limit and added more specific check
-            if row > ws.max_row + 10:
-                print(f"⚠️ Safety break at row {row} (max_row: {ws.max_row})")
-                break
+            # Read party information
+            dc_data['sender_name'] = header_value(8, 2) or 'Unknown Sender'
+            dc_data['receiver_name'] = header_value(8, 6) or 'Unknown Receiver'
+            dc_data['hub_address'] = header_value(9, 6) or 'Unknown Address'
+            
+            # Determine hub type from sender name
+            dc_data['hub_type'] = classify_hub_type(dc_data['sender_name'])
+            
+            # Read product data starting from row 14
+            rows = list(iter_product_rows(ws))
+            
+            # Numeric columns converted in one batch; the PDF generator does its own
+            # Decimal rounding so plain floats are enough here
+            quantities = np.asarray([r[2] for r in rows], dtype=np.float64)
+            values = np.asarray([r[3] for r in rows], dtype=np.float64)
+            gst_rates = np.asarray([r[4] for r in rows], dtype=np.float64)
+            cess_amts = np.asarray([r[5] for r in rows], dtype=np.float64)
+            
+            # Convert CESS amount back to rate
+            cess_rates = np.divide(cess_amts * 100.0, values,
+                                   out=np.zeros_like(values), where=values != 0)
+            
+            products = [
+                {
+                    'Description': description or 'Unknown Product',
+                    'HSN': hsn or 'Unknown',
+                    'Quantity': qty,
+                    'Value': value,
+                    'GST Rate': gst_rate,
+                    'Cess': cess_rate
+                }
+                for (description, hsn, *_), qty, value, gst_rate, cess_rate in zip(
+                    rows, quantities.tolist(), values.tolist(), gst_rates.tolist(), cess_rates.tolist())
+            ]
+        finally:
+            wb.close()
         
         dc_data['products'] = products
         
@@ -113,6 +143,8 @@ def main():
         print(f"❌ Excel file not found: {excel_path}")
         return
     
+    from src.pdf_generator.dc_pdf_generator import create_dc_pdf_from_excel_data
+    
     # Read the Excel data
     dc_data = read_excel_dc_data(excel_path)
     if not dc_data:
@@ -6,6 +6,27 @@ Convert Google Sheets credentials.json to Streamlit secrets format
 import json
 import sys
 
+try:
+    import tomli_w
+except ImportError:
+    tomli_w = None
+
+def _to_toml_section(creds):
+    """Serialize credentials as a [gcp_service_account] TOML table"""
+    if tomli_w is not None:
+        return tomli_w.dumps({'gcp_service_account': creds})
+    
+    # JSON string escaping is valid TOML basic-string escaping, so embedded
+    # newlines (private_key) and quotes survive the round trip. Non-ASCII is
+    # written as is: JSON's \uXXXX surrogate pairs are invalid TOML, and DEL,
+    # which JSON leaves alone, must be escaped in TOML
+    lines = ['[gcp_service_account]']
+    for key, value in creds.items():
+        text = json.dumps(value if isinstance(value, str) else str(value), ensure_ascii=False)
+        text = text.replace('\x7f', '\\u007f')
+        lines.append(f'{key} = {text}')
+    return '\n'.join(lines) + '\n'
+
 def convert_to_streamlit_secrets(json_file_path):
     """Convert credentials.json to Streamlit secrets.toml format"""
     
@@ -17,21 +38,7 @@ def convert_to_streamlit_secrets(json_file_path):
         print("STREAMLIT SECRETS FORMAT (Copy this to Streamlit Cloud Secrets)")
         print("=" * 70)
         print()
-        print("[gcp_service_account]")
-        
-        # Handle each field
-        for key, value in creds.items():
-            if isinstance(value, str):
-                # Escape quotes and handle multiline strings (like private_key)
-                if '\n' in value:
-                    # For multiline strings, use triple quotes
-                    escaped_value = value.replace('\\n', '\\n')  # Keep as literal \n
-                    print(f'{key} = """{escaped_value}"""')
-                else:
-                    escaped_value = value.replace('"', '\\"')
-                    print(f'{key} = "{escaped_value}"')
-            else:
-                print(f'{key} = "{value}"')
+        print(_to_toml_section(creds), end='')
         
         print()
         print("=" * 70)
@@ -7,16 +7,25 @@ Usage: python convert_json_to_streamlit_secrets.py path/to/credentials.json
 import json
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def convert_json_to_streamlit_secrets(json_file_path):
     """Convert JSON credentials to Streamlit secrets TOML format"""
     
     try:
-        # Read the JSON file
-        with open(json_file_path, 'r') as f:
-            creds = json.load(f)
+        # Read the JSON file as raw bytes and validate it in one parse
+        with open(json_file_path, 'rb') as f:
+            raw = f.read()
         
-        # Convert to single-line JSON string
-        creds_str = json.dumps(creds)
+        # Convert to the tightest single-line JSON string
+        if orjson is not None:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            creds_str = orjson.dumps(orjson.loads(raw)).decode()
+        else:
+            creds_str = json.dumps(json.loads(raw), separators=(',', ':'))
         
         # Create the TOML format
         toml_output = f'GOOGLE_SHEETS_CREDENTIALS = \'{creds_str}\''
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Backoff - Retry helpers for the remote sequence backends
+Waits use exponential backoff with full jitter (a random delay between 0 and
+min(cap, base * 2**attempt)), so sessions that fail together do not all retry
+together. A Retry-After header on a 429/503 response takes precedence, up to
+the same cap.
+"""
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+T = TypeVar('T')
+
+BASE_DELAY = 0.1
+MAX_DELAY = 8.0
+MAX_ATTEMPTS = 5
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status of the response attached to an error (httpx, requests/gspread), if any"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if isinstance(status, int):
+        return status
+    # postgrest's APIError keeps no response, only a code, which is the HTTP
+    # status when the gateway rather than Postgres rejected the call
+    code = getattr(error, 'code', None)
+    if isinstance(code, str) and len(code) == 3 and code.isdigit():
+        return int(code)
+    return None
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Seconds requested by the Retry-After header of the error's response
+
+    Returns:
+        Delay in seconds, or None if there is no usable header
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # HTTP-date form
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_transient(error: Exception) -> bool:
+    """True for rate limiting, server errors and network failures"""
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def is_unsent(error: Exception) -> bool:
+    """
+    True when the request was refused or never reached the server
+
+    Narrower than is_transient, for calls that advance a counter: after a
+    read timeout or a 500 the server may already have committed, and a
+    retry would consume a second number.
+    """
+    status = _status_code(error)
+    if status is not None:
+        return status in (429, 503)
+    if httpx is not None and isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    return isinstance(error, ConnectionRefusedError)
+
+
+def backoff_delay(attempt: int, error: Exception = None,
+                  base: float = BASE_DELAY, cap: float = MAX_DELAY) -> float:
+    """
+    Seconds to wait before retry number attempt + 1
+
+    Args:
+        attempt: Zero-based index of the attempt that just failed
+        error: The failure; its Retry-After header is honored when present
+        base: Delay ceiling of the first retry
+        cap: Upper bound of the delay, Retry-After included
+    """
+    retry_after = retry_after_seconds(error) if error is not None else None
+    if retry_after is not None:
+        # A server asking for minutes must not stall a DC generation request
+        return min(retry_after, cap)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def call_with_backoff(func: Callable[[], T], attempts: int = MAX_ATTEMPTS,
+                      retry_if: Callable[[Exception], bool] = is_transient) -> T:
+    """
+    Call func, retrying failures that retry_if accepts
+
+    The last error is re-raised once attempts are used up; errors retry_if
+    rejects are raised immediately.
+    """
+    for attempt in range(attempts):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == attempts - 1 or not retry_if(e):
+                raise
+            time.sleep(backoff_delay(attempt, e))
+
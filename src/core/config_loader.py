@@ -5,14 +5,144 @@ Loads configuration from CSV files to replace hardcoded values
 """
 
 import pandas as pd
+import functools
 import os
-from typing import Dict, Optional, Tuple, List
+import pickle
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sys import intern
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple, List
 import logging
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Built caches are persisted here (inside data_dir) and reused while the
+# source CSVs are unchanged; bump CACHE_VERSION when the cache layout changes
+CACHE_FILE = ".config_cache.pkl"
+CACHE_VERSION = 1
+
+# final_address.csv columns read by the cache build, in unpacking order
+ADDRESS_COLUMNS = (
+    'Entity name', 'State', 'GST No',
+    'FC Name', 'FC Seller Address 1', 'FC Seller Address 1.1', 'Seller Pin code', 'Fssai',
+    'Hub Name', 'HUB Buyers Address 1', 'HUB Buyers Address 1.1', 'HUB Buyers Pin code',
+)
+
+# Code-like TaxMaster columns that must stay text (mixed types otherwise)
+TAX_MASTER_TEXT_COLUMNS = ('Jpin', 'hsnCode', 'declarationForm')
+
+# Cities recognised in FC addresses, in match-priority order
+CITIES_TO_CHECK = (
+    'hyderabad', 'bengaluru', 'bangalore', 'delhi', 'pune', 'mumbai', 
+    'chennai', 'kolkata', 'patna', 'lucknow', 'ranchi', 'jaipur', 
+    'ahmedabad', 'guwahati', 'bhubaneswar', 'vijayawada', 'visakhapatnam',
+    'kochi', 'thiruvananthapuram', 'indore', 'bhopal', 'raipur', 'chandigarh',
+    'ludhiana', 'amritsar', 'jalandhar', 'gurgaon', 'gurugram', 'noida',
+    'ghaziabad', 'faridabad', 'mysore', 'mysuru', 'mangalore', 'mangaluru',
+    'hubli', 'dharwad', 'belgaum', 'belagavi', 'gulbarga', 'kalaburagi',
+    'davangere', 'shimoga', 'shivamogga', 'tumkur', 'tumakuru', 'hassan',
+    'bidar', 'hospet', 'hosapete', 'udupi', 'gadag', 'betageri', 'raichur',
+    'bagalkot', 'haveri', 'chitradurga', 'kolar', 'mandya', 'chikmagalur',
+    'chikkamagaluru', 'gangavathi', 'karwar', 'gokak', 'ranibennur', 'sira',
+    'puttur', 'chintamani', 'chamrajnagar', 'chamarajanagar', 'dandeli',
+    'hiriyur', 'shahabad', 'bhatkal', 'haliyal', 'ankola', 'kumta', 'sirsi',
+    'siddapur', 'yellapur', 'mundgod', 'honnavar'
+)
+
+# Old or alternate spellings mapped to the official city name
+CITY_CANONICAL = {
+    'bangalore': 'Bengaluru',
+    'gurgaon': 'Gurugram',
+    'mysore': 'Mysuru',
+    'mangalore': 'Mangaluru',
+    'belgaum': 'Belagavi',
+    'gulbarga': 'Kalaburagi',
+    'shimoga': 'Shivamogga',
+    'tumkur': 'Tumakuru',
+    'hospet': 'Hosapete',
+    'chikmagalur': 'Chikkamagaluru',
+}
+
+# Earliest list position wins when an address mentions several cities
+_CITY_PRIORITY = {city: rank for rank, city in enumerate(CITIES_TO_CHECK)}
+
+# One scan per address; the lookahead reports overlapping matches too
+_CITY_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(city) for city in sorted(_CITY_PRIORITY, key=len, reverse=True)) + '))'
+)
+
+# FC names like 'FC-Hyderabad': the alphabetic segment after the first '-'
+_FC_CITY_RE = re.compile(r'[^-]*-\s*([^\W\d_]{3,})\s*(?:-|\Z)')
+
+# (substring, standard name) checked in order against the upper-cased name
+_COMPANY_NAME_RULES = (
+    ('SOURCINGBEE', 'SOURCINGBEE'),
+    ('SOURCING BEE', 'SOURCINGBEE'),
+    ('AMOLAKCHAND', 'AMOLAKCHAND'),
+    ('BODEGA', 'BODEGA'),
+    ('TAILHUB', 'TAILHUB'),
+)
+
+
+def read_csv(file_path: str, usecols=None, text_columns=()) -> pd.DataFrame:
+    """
+    Read a CSV with pyarrow's multithreaded reader, falling back to pandas' C engine
+    
+    Args:
+        file_path: CSV file to read
+        usecols: Columns to keep (missing ones are tolerated); all columns if None
+        text_columns: Columns kept as raw text instead of being type-inferred
+    """
+    if pa_csv is not None:
+        try:
+            # Typed as strings up front: pandas' engine='pyarrow' infers first
+            # and casts after, turning e.g. '1.04E+13' into '10400000000000.0'
+            convert_options = pa_csv.ConvertOptions(
+                column_types={col: pa.string() for col in text_columns},
+                include_columns=list(usecols or ()),
+                include_missing_columns=usecols is not None,
+                strings_can_be_null=True,
+            )
+            table = pa_csv.read_csv(file_path, convert_options=convert_options)
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        except (pa.ArrowException, ValueError) as e:
+            logger.debug(f"pyarrow could not read {file_path}, using the C engine: {e}")
+    return pd.read_csv(
+        file_path, usecols=None if usecols is None else (lambda col: col in usecols),
+        dtype={col: str for col in text_columns}, engine='c', low_memory=False
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_company_name(company: str) -> str:
+    """
+    Normalize company name for consistent lookups
+    
+    Args:
+        company: Company name from data
+        
+    Returns:
+        Normalized company name
+    """
+    company = company.upper().strip()
+    
+    # Map variations to standard names
+    for needle, standard_name in _COMPANY_NAME_RULES:
+        if needle in company:
+            return standard_name
+            
+    return company
+
 
 class ConfigurationLoader:
     """
@@ -30,31 +160,120 @@ class ConfigurationLoader:
             data_dir: Directory containing CSV files
         """
         self.data_dir = data_dir
-        self.org_names = None
         self.final_address = None
         self.tax_master = None
         
         # Cached lookups
+        self._org_name_cache = {}
         self._gstin_cache = {}
         self._fc_address_cache = {}
         self._hub_address_cache = {}
         self._state_code_cache = {}
+        self._company_state_set = set()
+        self._state_fcs = {}
+        self._state_hubs = {}
+        self._company_states = {}
+        self._company_fcs = {}
+        self._company_hubs = {}
+        self._state_companies = {}
+        
+    # Attributes written to / restored from the on-disk cache
+    _CACHED_ATTRS = (
+        '_org_name_cache', '_gstin_cache', '_fc_address_cache', '_hub_address_cache',
+        '_state_code_cache', '_company_state_set', '_state_fcs', '_state_hubs',
+        '_company_states', '_company_fcs', '_company_hubs', '_state_companies',
+    )
+    
+    # Cached attributes whose values are read-only address mappings, which
+    # pickle cannot serialize directly
+    _ADDRESS_ATTRS = ('_fc_address_cache', '_hub_address_cache')
         
     def load_all(self):
         """Load all configuration files"""
+        # Unchanged CSVs: restore the built caches and skip parsing entirely
+        # (final_address and tax_master DataFrames stay None in that case)
+        signature = self._source_signature()
+        if self._load_cache(signature):
+            logger.info("✅ Configuration loaded from cache")
+            return
+        
         logger.info("Loading configuration files...")
-        self._load_org_names()
-        self._load_final_address()
-        self._load_tax_master()
+        # The three CSVs are independent and both parsers release the GIL,
+        # so they parse concurrently; result() re-raises any load failure
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            loads = [
+                executor.submit(self._load_org_names),
+                executor.submit(self._load_final_address),
+                executor.submit(self._load_tax_master),
+            ]
+            for load in loads:
+                load.result()
         self._build_caches()
+        self._save_cache(signature)
         logger.info("✅ Configuration loaded successfully")
         
+    def _source_signature(self) -> Tuple:
+        """(path, mtime, size) of each source CSV; None stats for missing files"""
+        signature = []
+        for file_path in (os.path.join(self.data_dir, "Org_Names.csv"),
+                          os.path.join(self.data_dir, "final_address.csv"),
+                          self._tax_master_path()):
+            try:
+                stat = os.stat(file_path)
+                signature.append((file_path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((file_path, None, None))
+        return tuple(signature)
+        
+    def _load_cache(self, signature: Tuple) -> bool:
+        """Restore the built caches if the cache file matches the source CSVs"""
+        cache_path = os.path.join(self.data_dir, CACHE_FILE)
+        if not os.path.exists(cache_path):
+            return False
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') != CACHE_VERSION or cached.get('signature') != signature:
+                return False
+            for attr in self._CACHED_ATTRS:
+                setattr(self, attr, cached[attr])
+            for attr in self._ADDRESS_ATTRS:
+                setattr(self, attr, {key: MappingProxyType(info) for key, info in cached[attr].items()})
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable config cache {cache_path}: {e}")
+            return False
+            
+    def _save_cache(self, signature: Tuple):
+        """Write the built caches next to the CSVs (best effort)"""
+        if self.final_address is None:
+            return
+        cache_path = os.path.join(self.data_dir, CACHE_FILE)
+        cached = {attr: getattr(self, attr) for attr in self._CACHED_ATTRS}
+        for attr in self._ADDRESS_ATTRS:
+            cached[attr] = {key: dict(info) for key, info in cached[attr].items()}
+        cached.update(version=CACHE_VERSION, signature=signature)
+        try:
+            # Write then rename so a concurrent reader never sees a partial file
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write config cache {cache_path}: {e}")
+        
     def _load_org_names(self):
         """Load Org_Names.csv"""
         file_path = os.path.join(self.data_dir, "Org_Names.csv")
         try:
-            self.org_names = pd.read_csv(file_path)
-            logger.info(f"✅ Loaded {len(self.org_names)} organizations from Org_Names.csv")
+            org_columns = ('org_profile_id', 'org_name')
+            org_names = read_csv(
+                file_path, usecols=org_columns, text_columns=org_columns
+            ).drop_duplicates('org_profile_id')
+            # First row per profile ID wins, as the old mask lookup did
+            self._org_name_cache = dict(zip(org_names['org_profile_id'].tolist(),
+                                            org_names['org_name'].tolist()))
+            logger.info(f"✅ Loaded {len(self._org_name_cache)} organizations from Org_Names.csv")
         except Exception as e:
             logger.error(f"❌ Failed to load Org_Names.csv: {e}")
             raise
@@ -63,193 +282,137 @@ class ConfigurationLoader:
         """Load final_address.csv"""
         file_path = os.path.join(self.data_dir, "final_address.csv")
         try:
-            self.final_address = pd.read_csv(file_path)
+            # Only the columns the cache build reads, all kept as text so pin
+            # codes and GSTINs are never reinterpreted as numbers
+            self.final_address = read_csv(
+                file_path, usecols=ADDRESS_COLUMNS, text_columns=ADDRESS_COLUMNS
+            )
             logger.info(f"✅ Loaded {len(self.final_address)} address records from final_address.csv")
         except Exception as e:
             logger.error(f"❌ Failed to load final_address.csv: {e}")
             raise
             
-    def _load_tax_master(self):
-        """Load TaxMasterGstDump CSV"""
+    def _tax_master_path(self) -> str:
+        """Path of the tax master CSV in use"""
         # Try the specific file first
         file_path = os.path.join(self.data_dir, "TaxMasterGstDump-20-06-2025-19-09-57.csv")
         if not os.path.exists(file_path):
             # Fallback to TaxMaster.csv
             file_path = os.path.join(self.data_dir, "TaxMaster.csv")
+        return file_path
         
+    def _load_tax_master(self):
+        """Load TaxMasterGstDump CSV"""
+        file_path = self._tax_master_path()
         try:
-            self.tax_master = pd.read_csv(file_path)
+            self.tax_master = read_csv(file_path, text_columns=TAX_MASTER_TEXT_COLUMNS)
             logger.info(f"✅ Loaded {len(self.tax_master)} tax records from {os.path.basename(file_path)}")
         except Exception as e:
             logger.warning(f"⚠️ Failed to load tax master: {e}")
             self.tax_master = None
             
     def _build_caches(self):
-        """Build lookup caches for fast access"""
-        if self.final_address is not None:
-            self._build_gstin_cache()
-            self._build_fc_address_cache()
-            self._build_hub_address_cache()
-            self._build_state_code_cache()
+        """Build all lookup caches in a single pass over final_address"""
+        if self.final_address is None:
+            return
+        
+        frame = self.final_address.reindex(columns=list(ADDRESS_COLUMNS)).fillna('')
+        companies = [self._normalize_company_name(entity) for entity in frame['Entity name'].tolist()]
+        columns = [frame[col].tolist() for col in ADDRESS_COLUMNS[1:]]
+        
+        for (company, state, gstin, fc_name, fc_address1, fc_address2, fc_pincode, fssai,
+                hub_name, hub_address1, hub_address2, hub_pincode) in zip(companies, *columns):
+            # Low-cardinality values repeat across rows and caches; share one copy
+            state, gstin, fc_name, hub_name = intern(state), intern(gstin), intern(fc_name), intern(hub_name)
             
-    def _build_gstin_cache(self):
-        """Build GSTIN lookup cache: (company, state) -> GSTIN"""
-        for _, row in self.final_address.iterrows():
-            company = self._normalize_company_name(row.get('Entity name', ''))
-            state = row.get('State', '')
-            gstin = row.get('GST No', '')
+            # Every (company, state) pair that has a row, with its FCs and hubs
+            # (dict keys keep first-seen order while deduplicating)
+            if company and state:
+                self._company_state_set.add((company, state))
+                if fc_name:
+                    self._state_fcs.setdefault((company, state), {})[fc_name] = None
+                if hub_name:
+                    self._state_hubs.setdefault((company, state), {})[hub_name] = None
             
+            # GSTIN lookup: (company, state) -> GSTIN
             if company and state and gstin:
-                key = (company, state)
-                self._gstin_cache[key] = gstin
-                
-        logger.info(f"✅ Built GSTIN cache with {len(self._gstin_cache)} entries")
-        
-    def _build_fc_address_cache(self):
-        """Build FC address cache: (company, fc_name) -> address info"""
-        for _, row in self.final_address.iterrows():
-            company = self._normalize_company_name(row.get('Entity name', ''))
-            fc_name = row.get('FC Name', '')
+                self._gstin_cache[(company, state)] = gstin
             
+            # FC address: (company, fc_name) -> address info
             if company and fc_name:
-                print(f"DEBUG: Processing FC '{fc_name}' for company '{company}'")
-                address_line1 = row.get('FC Seller Address 1', '')
-                address_line2 = row.get('FC Seller Address 1.1', '')
-                pincode = str(row.get('Seller Pin code', '')).strip()
-                state = row.get('State', '')
-                fssai = str(row.get('Fssai', '')).strip()
-                
-                # Combine address lines
-                full_address = f"{address_line1}, {address_line2}".strip(', ')
-                
-                # Extract city from FC Name or Address
-                city = ''
-                
-                # 1. Try to extract from FC Name (e.g., FC-Hyderabad -> Hyderabad)
-                if '-' in fc_name:
-                    parts = fc_name.split('-')
-                    if len(parts) > 1:
-                        potential_city = parts[1].strip()
-                        # Validate it's likely a city (no numbers, reasonable length)
-                        if potential_city.isalpha() and len(potential_city) > 2:
-                            city = potential_city
-                            print(f"DEBUG: Extracted city '{city}' from FC Name '{fc_name}'")
-                            
-                # 2. If not found, look in address
-                if not city:
-                    address_lower = full_address.lower()
-                    # Expanded list of cities
-                    cities_to_check = [
-                        'hyderabad', 'bengaluru', 'bangalore', 'delhi', 'pune', 'mumbai', 
-                        'chennai', 'kolkata', 'patna', 'lucknow', 'ranchi', 'jaipur', 
-                        'ahmedabad', 'guwahati', 'bhubaneswar', 'vijayawada', 'visakhapatnam',
-                        'kochi', 'thiruvananthapuram', 'indore', 'bhopal', 'raipur', 'chandigarh',
-                        'ludhiana', 'amritsar', 'jalandhar', 'gurgaon', 'gurugram', 'noida',
-                        'ghaziabad', 'faridabad', 'mysore', 'mysuru', 'mangalore', 'mangaluru',
-                        'hubli', 'dharwad', 'belgaum', 'belagavi', 'gulbarga', 'kalaburagi',
-                        'davangere', 'shimoga', 'shivamogga', 'tumkur', 'tumakuru', 'hassan',
-                        'bidar', 'hospet', 'hosapete', 'udupi', 'gadag', 'betageri', 'raichur',
-                        'bagalkot', 'haveri', 'chitradurga', 'kolar', 'mandya', 'chikmagalur',
-                        'chikkamagaluru', 'gangavathi', 'karwar', 'gokak', 'ranibennur', 'sira',
-                        'puttur', 'chintamani', 'chamrajnagar', 'chamarajanagar', 'dandeli',
-                        'hiriyur', 'shahabad', 'bhatkal', 'haliyal', 'ankola', 'kumta', 'sirsi',
-                        'siddapur', 'yellapur', 'mundgod', 'honnavar', 'karwar'
-                    ]
-                    
-                    for city_name in cities_to_check:
-                        if city_name in address_lower:
-                            city = city_name.title()
-                            # Handle special cases
-                            if city.lower() == 'bangalore': city = 'Bengaluru'
-                            if city.lower() == 'gurgaon': city = 'Gurugram'
-                            if city.lower() == 'mysore': city = 'Mysuru'
-                            if city.lower() == 'mangalore': city = 'Mangaluru'
-                            if city.lower() == 'belgaum': city = 'Belagavi'
-                            if city.lower() == 'gulbarga': city = 'Kalaburagi'
-                            if city.lower() == 'shimoga': city = 'Shivamogga'
-                            if city.lower() == 'tumkur': city = 'Tumakuru'
-                            if city.lower() == 'hospet': city = 'Hosapete'
-                            if city.lower() == 'chikmagalur': city = 'Chikkamagaluru'
-                            break
-                            
-                # 3. Fallback: Use FC Name itself if it looks like a city (no numbers/special chars)
-                if not city and fc_name.isalpha() and len(fc_name) > 2:
-                    city = fc_name.strip()
-                
-                key = (company, fc_name)
-                self._fc_address_cache[key] = {
+                logger.debug("Processing FC '%s' for company '%s'", fc_name, company)
+                full_address = f"{fc_address1}, {fc_address2}".strip(', ')
+                self._fc_address_cache[(company, fc_name)] = MappingProxyType({
                     'address': full_address,
-                    'address_line1': address_line1,
-                    'address_line2': address_line2,
-                    'pincode': pincode,
-                    'city': city,  # Added city
+                    'address_line1': fc_address1,
+                    'address_line2': fc_address2,
+                    'pincode': intern(str(fc_pincode).strip()),
+                    'city': intern(self._extract_fc_city(fc_name, full_address)),
                     'state': state,
-                    'fssai': fssai
-                }
-                
-        logger.info(f"✅ Built FC address cache with {len(self._fc_address_cache)} entries")
-        
-    def _build_hub_address_cache(self):
-        """Build Hub address cache: (company, hub_name) -> address info"""
-        for _, row in self.final_address.iterrows():
-            company = self._normalize_company_name(row.get('Entity name', ''))
-            hub_name = row.get('Hub Name', '')
+                    'fssai': intern(str(fssai).strip())
+                })
             
+            # Hub address: (company, hub_name) -> address info
             if company and hub_name:
-                address_line1 = row.get('HUB Buyers Address 1', '')
-                address_line2 = row.get('HUB Buyers Address 1.1', '')
-                pincode = str(row.get('HUB Buyers Pin code', '')).strip()
-                
-                # Combine address lines
-                full_address = f"{address_line1}, {address_line2}".strip(', ')
-                
-                key = (company, hub_name)
-                self._hub_address_cache[key] = {
-                    'address': full_address,
-                    'address_line1': address_line1,
-                    'address_line2': address_line2,
-                    'pincode': pincode
-                }
-                
+                self._hub_address_cache[(company, hub_name)] = MappingProxyType({
+                    'address': f"{hub_address1}, {hub_address2}".strip(', '),
+                    'address_line1': hub_address1,
+                    'address_line2': hub_address2,
+                    'pincode': intern(str(hub_pincode).strip())
+                })
+        
+        self._state_fcs = {key: list(fcs) for key, fcs in self._state_fcs.items()}
+        self._state_hubs = {key: list(hubs) for key, hubs in self._state_hubs.items()}
+        
+        # State code from GSTIN prefix (first 2 digits), first row per state wins
+        codes = frame.loc[(frame['State'] != '') & (frame['GST No'].str.len() >= 2), ['State', 'GST No']]
+        codes = codes.drop_duplicates('State')
+        self._state_code_cache = dict(zip(codes['State'].tolist(), codes['GST No'].str[:2].tolist()))
+        
+        # Per-company sorted name lists for the get_company_* getters
+        self._company_states = self._index_by_company(self._gstin_cache)
+        self._company_fcs = self._index_by_company(self._fc_address_cache)
+        self._company_hubs = self._index_by_company(self._hub_address_cache)
+        # Reverse index: state -> sorted companies that have a row there
+        self._state_companies = self._index_by_company(
+            (state, company) for company, state in self._company_state_set
+        )
+        
+        logger.info(f"✅ Built GSTIN cache with {len(self._gstin_cache)} entries")
+        logger.info(f"✅ Built FC address cache with {len(self._fc_address_cache)} entries")
         logger.info(f"✅ Built Hub address cache with {len(self._hub_address_cache)} entries")
+        logger.info(f"✅ Built state code cache with {len(self._state_code_cache)} entries")
         
-    def _build_state_code_cache(self):
-        """Build state code cache from GSTIN prefixes"""
-        for _, row in self.final_address.iterrows():
-            state = row.get('State', '')
-            gstin = row.get('GST No', '')
-            
-            if state and gstin and len(gstin) >= 2:
-                # Extract state code from GSTIN (first 2 digits)
-                state_code = gstin[:2]
-                if state not in self._state_code_cache:
-                    self._state_code_cache[state] = state_code
+    @staticmethod
+    def _index_by_company(pairs: Iterable[Tuple[str, str]]) -> Dict[str, Tuple[str, ...]]:
+        """Group (company, name) pairs, e.g. cache keys, into company -> sorted names"""
+        index = {}
+        for company, name in pairs:
+            index.setdefault(company, set()).add(name)
+        return {company: tuple(sorted(names)) for company, names in index.items()}
+        
+    def _extract_fc_city(self, fc_name: str, full_address: str) -> str:
+        """Extract city from FC Name or Address"""
+        # 1. Try to extract from FC Name (e.g., FC-Hyderabad -> Hyderabad)
+        match = _FC_CITY_RE.match(fc_name)
+        if match:
+            logger.debug("Extracted city '%s' from FC Name '%s'", match.group(1), fc_name)
+            return match.group(1)
                     
-        logger.info(f"✅ Built state code cache with {len(self._state_code_cache)} entries")
+        # 2. If not found, look in address
+        address_lower = full_address.lower()
+        hits = {match.group(1) for match in _CITY_PATTERN.finditer(address_lower)}
+        if hits:
+            city_name = min(hits, key=_CITY_PRIORITY.__getitem__)
+            return CITY_CANONICAL.get(city_name, city_name.title())
+                    
+        # 3. Fallback: Use FC Name itself if it looks like a city (no numbers/special chars)
+        if fc_name.isalpha() and len(fc_name) > 2:
+            return fc_name.strip()
         
-    def _normalize_company_name(self, company: str) -> str:
-        """
-        Normalize company name for consistent lookups
+        return ''
         
-        Args:
-            company: Company name from data
-            
-        Returns:
-            Normalized company name
-        """
-        company = company.upper().strip()
-        
-        # Map variations to standard names
-        if 'SOURCINGBEE' in company or 'SOURCING BEE' in company:
-            return 'SOURCINGBEE'
-        elif 'AMOLAKCHAND' in company:
-            return 'AMOLAKCHAND'
-        elif 'BODEGA' in company:
-            return 'BODEGA'
-        elif 'TAILHUB' in company:
-            return 'TAILHUB'
-            
-        return company
+    _normalize_company_name = staticmethod(normalize_company_name)
         
     # ========== Public API Methods ==========
     
@@ -263,13 +426,7 @@ class ConfigurationLoader:
         Returns:
             Organization name or None
         """
-        if self.org_names is None:
-            return None
-            
-        match = self.org_names[self.org_names['org_profile_id'] == org_profile_id]
-        if not match.empty:
-            return match.iloc[0]['org_name']
-        return None
+        return self._org_name_cache.get(org_profile_id)
         
     def get_gstin(self, company: str, state: str) -> Optional[str]:
         """
@@ -286,7 +443,7 @@ class ConfigurationLoader:
         key = (company, state)
         return self._gstin_cache.get(key)
         
-    def get_fc_address(self, company: str, fc_name: str) -> Optional[Dict]:
+    def get_fc_address(self, company: str, fc_name: str) -> Optional[Mapping[str, str]]:
         """
         Get FC address information
         
@@ -295,13 +452,13 @@ class ConfigurationLoader:
             fc_name: FC name
             
         Returns:
-            Dictionary with address, pincode, state, fssai or None
+            Read-only mapping with address, pincode, state, fssai or None
         """
         company = self._normalize_company_name(company)
         key = (company, fc_name)
         return self._fc_address_cache.get(key)
         
-    def get_hub_address(self, company: str, hub_name: str) -> Optional[Dict]:
+    def get_hub_address(self, company: str, hub_name: str) -> Optional[Mapping[str, str]]:
         """
         Get Hub address information
         
@@ -310,7 +467,7 @@ class ConfigurationLoader:
             hub_name: Hub name
             
         Returns:
-            Dictionary with address, pincode or None
+            Read-only mapping with address, pincode or None
         """
         company = self._normalize_company_name(company)
         key = (company, hub_name)
@@ -334,10 +491,7 @@ class ConfigurationLoader:
         
     def get_all_companies(self) -> List[str]:
         """Get list of all companies"""
-        companies = set()
-        for (company, _) in self._gstin_cache.keys():
-            companies.add(company)
-        return sorted(list(companies))
+        return sorted(self._company_states)
         
     def get_company_states(self, company: str) -> List[str]:
         """
@@ -349,12 +503,7 @@ class ConfigurationLoader:
         Returns:
             List of state names
         """
-        company = self._normalize_company_name(company)
-        states = set()
-        for (comp, state) in self._gstin_cache.keys():
-            if comp == company:
-                states.add(state)
-        return sorted(list(states))
+        return list(self._company_states.get(self._normalize_company_name(company), ()))
         
     def get_company_fcs(self, company: str) -> List[str]:
         """
@@ -366,12 +515,7 @@ class ConfigurationLoader:
         Returns:
             List of FC names
         """
-        company = self._normalize_company_name(company)
-        fcs = set()
-        for (comp, fc) in self._fc_address_cache.keys():
-            if comp == company:
-                fcs.add(fc)
-        return sorted(list(fcs))
+        return list(self._company_fcs.get(self._normalize_company_name(company), ()))
         
     def get_company_hubs(self, company: str) -> List[str]:
         """
@@ -383,12 +527,7 @@ class ConfigurationLoader:
         Returns:
             List of hub names
         """
-        company = self._normalize_company_name(company)
-        hubs = set()
-        for (comp, hub) in self._hub_address_cache.keys():
-            if comp == company:
-                hubs.add(hub)
-        return sorted(list(hubs))
+        return list(self._company_hubs.get(self._normalize_company_name(company), ()))
     
     def is_company_available_in_state(self, company: str, state: str) -> bool:
         """
@@ -401,22 +540,7 @@ class ConfigurationLoader:
         Returns:
             True if company operates in state, False otherwise
         """
-        company = self._normalize_company_name(company)
-        
-        # Check in GSTIN cache (fastest)
-        key = (company, state)
-        if key in self._gstin_cache:
-            return True
-        
-        # Double-check in final_address data
-        if self.final_address is not None:
-            matching_rows = self.final_address[
-                (self.final_address['Entity name'].str.contains(company, case=False, na=False)) &
-                (self.final_address['State'] == state)
-            ]
-            return len(matching_rows) > 0
-        
-        return False
+        return (self._normalize_company_name(company), state) in self._company_state_set
     
     def get_available_companies_for_state(self, state: str) -> List[str]:
         """
@@ -426,15 +550,9 @@ class ConfigurationLoader:
             state: State name
             
         Returns:
-            List of company names (SOURCINGBEE, AMOLAKCHAND, BODEGA)
+            Sorted list of normalized company names
         """
-        available_companies = []
-        
-        for company in ['SOURCINGBEE', 'AMOLAKCHAND', 'BODEGA']:
-            if self.is_company_available_in_state(company, state):
-                available_companies.append(company)
-        
-        return available_companies
+        return list(self._state_companies.get(state, ()))
     
     def get_company_info_for_state(self, company: str, state: str) -> Optional[Dict]:
         """
@@ -455,23 +573,9 @@ class ConfigurationLoader:
         # Get GSTIN
         gstin = self.get_gstin(company, state)
         
-        # Get FCs in this state
-        fcs = []
-        if self.final_address is not None:
-            fc_rows = self.final_address[
-                (self.final_address['Entity name'].str.contains(company, case=False, na=False)) &
-                (self.final_address['State'] == state)
-            ]
-            fcs = fc_rows['FC Name'].unique().tolist()
-        
-        # Get hubs in this state
-        hubs = []
-        if self.final_address is not None:
-            hub_rows = self.final_address[
-                (self.final_address['Entity name'].str.contains(company, case=False, na=False)) &
-                (self.final_address['State'] == state)
-            ]
-            hubs = hub_rows['Hub Name'].unique().tolist()
+        # Get FCs and hubs in this state
+        fcs = list(self._state_fcs.get((company, state), ()))
+        hubs = list(self._state_hubs.get((company, state), ()))
         
         return {
             'company': company,
@@ -485,6 +589,7 @@ class ConfigurationLoader:
 
 # Singleton instance
 _config_loader = None
+_config_loader_lock = threading.Lock()
 
 
 def get_config_loader(data_dir: str = "data") -> ConfigurationLoader:
@@ -499,8 +604,12 @@ def get_config_loader(data_dir: str = "data") -> ConfigurationLoader:
     """
     global _config_loader
     if _config_loader is None:
-        _config_loader = ConfigurationLoader(data_dir)
-        _config_loader.load_all()
+        with _config_loader_lock:
+            if _config_loader is None:
+                # Publish only a fully loaded instance to other threads
+                loader = ConfigurationLoader(data_dir)
+                loader.load_all()
+                _config_loader = loader
     return _config_loader
 
 
@@ -15,86 +15,256 @@ PERSISTENCE BACKENDS (priority order):
 """
 
 import os
+import sys
 import json
-from typing import Dict
+import atexit
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import logging
+
+from .backoff import call_with_backoff, is_unsent
+
+logger = logging.getLogger(__name__)
+
+def _min_max(values) -> Tuple[int, int]:
+    """Smallest and largest of values in a single pass; (0, 0) when empty"""
+    lowest = highest = None
+    for value in values:
+        if lowest is None:
+            lowest = highest = value
+        elif value < lowest:
+            lowest = value
+        elif value > highest:
+            highest = value
+    return (0, 0) if lowest is None else (lowest, highest)
+
+class DCReservationError(RuntimeError):
+    """A bulk reservation failed after the backend had already advanced some sequences"""
+    
+    def __init__(self, message: str, reserved: Dict[str, Tuple[int, int]]):
+        super().__init__(message)
+        # Sequence name -> (first, last) range taken from the backend but never issued
+        self.reserved = reserved
 
 class SupabaseSequenceGenerator:
+    # Upper bound on RPCs in flight at once from get_next_sequences
+    MAX_CONCURRENT_RPCS = 8
+    
     def __init__(self):
+        # RPC function name -> extractor for its response shape, see _sequence_value
+        self._extractors = {}
+        # Cleared once the database turns out not to define get_next_seq_batch
+        self._has_batch_rpc = True
+        
         # Use single Supabase project for all environments
-        print("🔄 SupabaseSequenceGenerator: Starting initialization...")
+        logger.info("🔄 SupabaseSequenceGenerator: Starting initialization...")
         
         try:
             import streamlit as st
-            print("✅ Streamlit imported successfully")
+            logger.info("✅ Streamlit imported successfully")
             self.supabase_url = os.getenv('SUPABASE_URL') or st.secrets['SUPABASE_URL']
             self.supabase_key = os.getenv('SUPABASE_KEY') or st.secrets['SUPABASE_KEY']
-            print(f"✅ Got credentials from streamlit secrets")
-            print(f"   URL: {self.supabase_url[:30]}..." if self.supabase_url else "   URL: None")
-            print(f"   Key: {self.supabase_key[:30]}..." if self.supabase_key else "   Key: None")
+            logger.info(f"✅ Got credentials from streamlit secrets")
+            logger.debug(f"   URL: {self.supabase_url[:30]}..." if self.supabase_url else "   URL: None")
+            logger.debug(f"   Key: {self.supabase_key[:30]}..." if self.supabase_key else "   Key: None")
         except (ImportError, KeyError) as e:
-            print(f"⚠️ Streamlit secrets failed ({e}), trying environment variables...")
+            logger.warning(f"⚠️ Streamlit secrets failed ({e}), trying environment variables...")
             # Fallback when streamlit is not available or secrets not configured
             self.supabase_url = os.getenv('SUPABASE_URL')
             self.supabase_key = os.getenv('SUPABASE_KEY')
-            print(f"   ENV URL: {self.supabase_url[:30]}..." if self.supabase_url else "   ENV URL: None")
-            print(f"   ENV Key: {self.supabase_key[:30]}..." if self.supabase_key else "   ENV Key: None")
+            logger.debug(f"   ENV URL: {self.supabase_url[:30]}..." if self.supabase_url else "   ENV URL: None")
+            logger.debug(f"   ENV Key: {self.supabase_key[:30]}..." if self.supabase_key else "   ENV Key: None")
         
         if not self.supabase_url or not self.supabase_key:
             raise ValueError(f"Supabase credentials not found - URL: {bool(self.supabase_url)}, Key: {bool(self.supabase_key)}")
         
-        print("🔄 Creating Supabase client...")
+        logger.info("🔄 Creating Supabase client...")
         from supabase import create_client
         self.supabase = create_client(self.supabase_url, self.supabase_key)
-        print("✅ Supabase client created successfully")
+        logger.info("✅ Supabase client created successfully")
+    
+    def _sequence_value(self, rpc_name: str, data, sequence_name: str) -> int:
+        """
+        Extract the integer from an RPC response (scalar or one-element list)
+        
+        The shape is a property of the database function, so it is detected
+        on the first response and later responses skip the type checks.
+        """
+        extract = self._extractors.get(rpc_name)
+        if extract is not None:
+            try:
+                return int(extract(data))
+            except (TypeError, ValueError, LookupError):
+                pass  # Shape changed (function redefined) or no data; re-detect below
+        
+        if data is not None:
+            if isinstance(data, list) and len(data) > 0:
+                extract = itemgetter(0)
+            elif isinstance(data, int):
+                extract = int
+            else:
+                logger.warning(f"⚠️ Unexpected Supabase result format: {data}")
+                raise ValueError(f"Unexpected result format: {data}")
+            self._extractors[rpc_name] = extract
+            return int(extract(data))
+        raise ValueError(f"No data returned for {sequence_name}")
+    
+    def get_next_sequences(self, sequence_names: List[str]) -> List[int]:
+        """
+        Increment several sequences with concurrent get_next_seq RPC calls
+        
+        The calls share the Supabase client's keep-alive connection pool
+        (one httpx.Client for the life of the process), so N calls take
+        roughly one round trip instead of N, without a new TLS handshake.
+        
+        Returns:
+            Next value for each name, in the same order
+            
+        Raises:
+            DCReservationError: If some RPCs failed after others had advanced
+                their sequences; the first failure is raised as is otherwise
+        """
+        if not sequence_names:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_RPCS, len(sequence_names))) as pool:
+            futures = [pool.submit(self.get_next_sequence, name) for name in sequence_names]
+        
+        values, reserved, error = [], {}, None
+        for name, future in zip(sequence_names, futures):
+            try:
+                value = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            values.append(value)
+            reserved[name] = (value, value)
+        if error is None:
+            return values
+        if not reserved:
+            raise error
+        raise DCReservationError(str(error), reserved) from error
     
     def get_next_sequence(self, sequence_name: str) -> int:
         try:
-            result = self.supabase.rpc('get_next_seq', {'seq_name': sequence_name}).execute()
-            if result.data is not None:
-                if isinstance(result.data, list) and len(result.data) > 0:
-                    return int(result.data[0])
-                elif isinstance(result.data, int):
-                    return result.data
-                else:
-                    print(f"⚠️ Unexpected Supabase result format: {result.data}")
-                    raise ValueError(f"Unexpected result format: {result.data}")
-            raise ValueError(f"No data returned for {sequence_name}")
+            # Increments are only retried when they cannot have been applied
+            result = call_with_backoff(
+                self.supabase.rpc('get_next_seq', {'seq_name': sequence_name}).execute,
+                retry_if=is_unsent
+            )
+            return self._sequence_value('get_next_seq', result.data, sequence_name)
         except Exception as e:
-            print(f"⚠️ Supabase RPC error: {e}")
+            logger.warning(f"⚠️ Supabase RPC error: {e}")
             raise
     
+    @staticmethod
+    def _is_missing_function(error: Exception) -> bool:
+        """True when PostgREST reports that the called database function does not exist"""
+        return getattr(error, 'code', None) == 'PGRST202' or 'Could not find the function' in str(error)
+    
+    def get_next_sequence_batch(self, sequence_name: str, batch_size: int) -> int:
+        """
+        Reserve batch_size consecutive values with one RPC call
+        
+        Uses a get_next_seq_batch(seq_name, n) database function that
+        advances the counter by n in a single UPDATE ... RETURNING and
+        returns the first value of the reserved block. Databases without
+        that function fall back to batch_size get_next_seq calls.
+        """
+        if self._has_batch_rpc:
+            try:
+                result = call_with_backoff(self.supabase.rpc(
+                    'get_next_seq_batch', {'seq_name': sequence_name, 'n': batch_size}
+                ).execute, retry_if=is_unsent)
+                return self._sequence_value('get_next_seq_batch', result.data, sequence_name)
+            except Exception as e:
+                if not self._is_missing_function(e):
+                    logger.warning(f"⚠️ Supabase get_next_seq_batch RPC error: {e}")
+                    raise
+                logger.info("ℹ️ get_next_seq_batch not defined, reserving numbers one at a time")
+                self._has_batch_rpc = False
+        
+        first_seq = self.get_next_sequence(sequence_name)
+        for offset in range(1, batch_size):
+            next_seq = self.get_next_sequence(sequence_name)
+            if next_seq != first_seq + offset:
+                # Another writer took a number inside the block; handing it out would duplicate it
+                raise ValueError(f"Non-consecutive values for {sequence_name}: "
+                                 f"expected {first_seq + offset}, got {next_seq}")
+        return first_seq
+    
     def get_current_sequence_value(self, sequence_name: str) -> int:
         """
         Get current sequence value WITHOUT incrementing it using the new RPC function
         """
         try:
-            result = self.supabase.rpc('get_current_seq', {'seq_name': sequence_name}).execute()
-            if result.data is not None:
-                if isinstance(result.data, list) and len(result.data) > 0:
-                    return int(result.data[0])
-                elif isinstance(result.data, int):
-                    return result.data
-                else:
-                    print(f"⚠️ Unexpected Supabase result format: {result.data}")
-                    raise ValueError(f"Unexpected result format: {result.data}")
-            raise ValueError(f"No data returned for {sequence_name}")
+            result = call_with_backoff(
+                self.supabase.rpc('get_current_seq', {'seq_name': sequence_name}).execute
+            )
+            return self._sequence_value('get_current_seq', result.data, sequence_name)
         except Exception as e:
-            print(f"⚠️ Supabase get_current_seq RPC error: {e}")
+            logger.warning(f"⚠️ Supabase get_current_seq RPC error: {e}")
             raise
+    
+    def get_all_sequences(self) -> Dict[str, int]:
+        """
+        Get all sequences as a dictionary
+        
+        Uses a get_all_seqs() database function returning a JSON object of
+        sequence name to current value. Databases without that function
+        fall back to reading the dc_sequences table (complete_supabase_setup.sql).
+        """
+        try:
+            result = call_with_backoff(self.supabase.rpc('get_all_seqs', {}).execute)
+            return {name: int(value) for name, value in (result.data or {}).items()}
+        except Exception as e:
+            if not self._is_missing_function(e):
+                logger.warning(f"⚠️ Supabase get_all_seqs RPC error: {e}")
+                return {}
+        
+        try:
+            result = call_with_backoff(
+                self.supabase.table('dc_sequences').select('prefix,current_number').execute
+            )
+            # Table rows are keyed by DC prefix (AKDCAH); sequences are named akdcah_seq
+            return {f"{row['prefix'].lower()}_seq": int(row['current_number'])
+                    for row in result.data or []}
+        except Exception as e:
+            logger.warning(f"⚠️ Supabase dc_sequences query error: {e}")
+            return {}
 
 class LocalSequenceGenerator:
+    # Fold the append-only log back into the JSON snapshot after this many entries
+    COMPACT_AFTER = 10000
+    
     def __init__(self, state_file='dc_sequence_state_v2.json'):
         self.state_file = state_file
+        # Increments are appended here as one small JSON line each instead of
+        # rewriting the whole snapshot; replayed on top of it at startup
+        self.log_file = f"{os.path.splitext(state_file)[0]}.log"
+        self._log = None
+        self._log_entries = 0
+        self._log_torn = False
+        # Guards read + increment + save so concurrent reruns never share a number
+        # (re-entrant so compact() can run from inside an increment)
+        self._lock = threading.RLock()
         self.sequences = self._load_sequences()
+        if self._log_torn:
+            # Start a clean log so new entries are not glued onto the torn line
+            self.compact()
+        atexit.register(self.close)
     
     def _load_sequences(self):
         try:
             with open(self.state_file, 'r') as f:
-                return json.load(f)
+                sequences = json.load(f)
         except FileNotFoundError:
             # Default sequences starting at 300
-            return {
+            sequences = {
                 'akdcah_seq': 300,
                 'akdcsg_seq': 300,
                 'bddcah_seq': 300,
@@ -102,95 +272,249 @@ class LocalSequenceGenerator:
                 'sbdcah_seq': 300,
                 'sbdcsg_seq': 300
             }
+        
+        # Entries hold absolute values, so replaying over a snapshot that
+        # already includes them (crash during compaction) is harmless
+        try:
+            with open(self.log_file, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn line from a crash mid-append
+                        self._log_torn = True
+                        continue
+                    sequences[entry['name']] = entry['val']
+                    self._log_entries += 1
+        except FileNotFoundError:
+            pass
+        return sequences
     
-    def _save_sequences(self):
-        with open(self.state_file, 'w') as f:
-            json.dump(self.sequences, f, indent=2)
+    def _save_sequences(self, sequence_name: str):
+        """Append the sequence's new value to the log and sync it to disk"""
+        if self._log is None:
+            self._log = open(self.log_file, 'a')
+        self._log.write(json.dumps({'name': sequence_name, 'val': self.sequences[sequence_name]}) + '\n')
+        self._log.flush()
+        # Synced on every entry: a value lost in a crash would be issued twice
+        os.fsync(self._log.fileno())
+        self._log_entries += 1
+        if self._log_entries >= self.COMPACT_AFTER:
+            self.compact()
+    
+    def compact(self):
+        """Rewrite the JSON snapshot with the current values and empty the log"""
+        with self._lock:
+            # Write a temp file and rename it over the state file so a crash
+            # mid-write never leaves a truncated or half-updated JSON behind
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(self.sequences, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.state_file)
+            
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            open(self.log_file, 'w').close()
+            self._log_entries = 0
+    
+    def close(self):
+        """Fold the log into the JSON snapshot and release the log file handle"""
+        with self._lock:
+            if self._log_entries:
+                self.compact()
+            elif self._log is not None:
+                self._log.close()
+                self._log = None
     
     def get_next_sequence(self, sequence_name: str) -> int:
-        if sequence_name not in self.sequences:
-            self.sequences[sequence_name] = 300
-        
-        self.sequences[sequence_name] += 1
-        next_seq = self.sequences[sequence_name]
-        self._save_sequences()
-        return next_seq
+        return self.get_next_sequence_batch(sequence_name, 1)
+    
+    def get_next_sequence_batch(self, sequence_name: str, batch_size: int) -> int:
+        """Reserve batch_size consecutive values; returns the first one"""
+        with self._lock:
+            if sequence_name not in self.sequences:
+                self.sequences[sequence_name] = 300
+            
+            first_seq = self.sequences[sequence_name] + 1
+            self.sequences[sequence_name] += batch_size
+            self._save_sequences(sequence_name)
+            return first_seq
+    
+    def get_current_sequence_value(self, sequence_name: str) -> int:
+        """Get current sequence value WITHOUT incrementing"""
+        return self.sequences.get(sequence_name, 300)
+    
+    def get_all_sequences(self) -> Dict[str, int]:
+        """Get all sequences as a dictionary"""
+        with self._lock:
+            return dict(self.sequences)
 
 class DCSequenceManager:
+    # Facility code for facilities not listed in facility_codes
+    UNKNOWN_FACILITY_CODE = 'XX'
+    # Seconds a current value read from the backend is served from _current_cache
+    CURRENT_CACHE_TTL = 5.0
+    
     def __init__(self):
+        # The backend is picked (and its connection tested) on first use rather
+        # than here, so importing this module never waits on the network
+        self._generator = None
+        self._generator_lock = threading.Lock()
+        
+        # Codes are interned so the (company, facility, hub) keys of _seq_names
+        # compare by identity
+        self.company_codes = {name: sys.intern(code) for name, code in
+                              {'AMOLAKCHAND': 'AK', 'BODEGA': 'BD', 'SOURCINGBEE': 'SB'}.items()}
+        self.facility_codes = {name: sys.intern(code) for name, code in {
+            'Sutlej/Gomati': 'SG', 
+            'Arihant': 'AH', 
+            'Vikrant': 'AH',
+            'FC-Hyderabad': 'HYD',  # Telangana facility
+            'Hyderabad': 'HYD'
+        }.items()}
+        
+        # Hub codes for Telangana (extracted from HYD_XXX format)
+        self.telangana_hubs = frozenset(map(sys.intern, ['BVG', 'SGR', 'BAL', 'KMP', 'NCH', 'SAN']))
+        
+        # Client-side batch allocation: reserve batch_size numbers per backend
+        # call and hand them out locally. Defaults to 1 (no batching) because
+        # numbers still cached when the process exits are never issued and
+        # leave gaps in the DC series; set DC_SEQUENCE_BATCH_SIZE to opt in.
+        self.batch_size = max(1, int(os.getenv('DC_SEQUENCE_BATCH_SIZE', '1')))
+        # sequence_name -> (next_value, end_value) of the reserved block
+        self._sequence_cache: Dict[str, Tuple[int, int]] = {}
+        self._sequence_lock = threading.Lock()
+        if self.batch_size > 1:
+            atexit.register(self.flush_cache)
+        
+        # sequence_name -> (current backend value, time.monotonic() it was seen);
+        # written through on every increment, so dashboard and health polling
+        # only reach the backend for sequences this process has not touched
+        self._current_cache: Dict[str, Tuple[int, float]] = {}
+        
+        # Every legal (company_code, facility_code, hub_code) -> (dc_template, sequence_name),
+        # enumerated up front with interned strings; facilities without a code
+        # share the UNKNOWN_FACILITY_CODE series
+        self._seq_names: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+        facility_codes = set(self.facility_codes.values()) | {self.UNKNOWN_FACILITY_CODE}
+        for company_code in self.company_codes.values():
+            for facility_code in facility_codes:
+                self._add_prefix(company_code, facility_code, '')
+                if facility_code == 'HYD':
+                    for hub_code in self.telangana_hubs:
+                        self._add_prefix(company_code, facility_code, hub_code)
+        
+        # (company_name, facility_name, hub_value) -> (dc_template, sequence_name)
+        self._prefix_cache: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+    
+    @property
+    def generator(self):
+        """Sequence backend, selected on first access"""
+        if self._generator is None:
+            with self._generator_lock:
+                if self._generator is None:
+                    self._generator = self._select_generator()
+        return self._generator
+    
+    @generator.setter
+    def generator(self, generator):
+        self._generator = generator
+    
+    def _select_generator(self):
+        """Return the first working backend"""
         # Try sequence generators in order: GitHub → Google Sheets → Supabase → Local JSON
         
         # 1. Try GitHub first (BEST for Streamlit Cloud - free, reliable, no quota limits)
         try:
-            print("🔄 Attempting to initialize GitHub sequence generator...")
+            logger.info("🔄 Attempting to initialize GitHub sequence generator...")
             from .github_sequence_generator import GitHubSequenceGenerator
-            self.generator = GitHubSequenceGenerator()
-            print("✅ Using GitHub sequence generator")
+            generator = GitHubSequenceGenerator()
+            logger.info("✅ Using GitHub sequence generator")
             
             # Test the connection
             try:
-                test_seq = self.generator.get_current_sequence_value('akdcah_seq')
-                print(f"✅ GitHub connection test successful: akdcah_seq = {test_seq}")
+                test_seq = generator.get_current_sequence_value('akdcah_seq')
+                logger.info(f"✅ GitHub connection test successful: akdcah_seq = {test_seq}")
             except Exception as test_error:
-                print(f"❌ GitHub connection test failed: {test_error}")
+                logger.error(f"❌ GitHub connection test failed: {test_error}")
                 raise test_error
                 
         except Exception as gh_error:
-            print(f"⚠️ GitHub unavailable ({type(gh_error).__name__}), trying Google Sheets...")
+            logger.warning(f"⚠️ GitHub unavailable ({type(gh_error).__name__}), trying Google Sheets...")
             
             # 2. Try Google Sheets as fallback
             try:
-                print("🔄 Attempting to initialize Google Sheets sequence generator...")
+                logger.info("🔄 Attempting to initialize Google Sheets sequence generator...")
                 from .google_sheets_sequence_generator import GoogleSheetsSequenceGenerator
-                self.generator = GoogleSheetsSequenceGenerator()
-                print("✅ Using Google Sheets sequence generator")
+                generator = GoogleSheetsSequenceGenerator()
+                logger.info("✅ Using Google Sheets sequence generator")
                 
                 # Test the connection
                 try:
-                    test_seq = self.generator.get_current_sequence_value('akdcah_seq')
-                    print(f"✅ Google Sheets connection test successful: akdcah_seq = {test_seq}")
+                    test_seq = generator.get_current_sequence_value('akdcah_seq')
+                    logger.info(f"✅ Google Sheets connection test successful: akdcah_seq = {test_seq}")
                 except Exception as test_error:
-                    print(f"❌ Google Sheets connection test failed: {test_error}")
+                    logger.error(f"❌ Google Sheets connection test failed: {test_error}")
                     raise test_error
                     
             except Exception as gs_error:
-                print(f"⚠️ Google Sheets unavailable ({type(gs_error).__name__}), trying Supabase...")
+                logger.warning(f"⚠️ Google Sheets unavailable ({type(gs_error).__name__}), trying Supabase...")
                 
                 # 3. Try Supabase as fallback
                 try:
-                    print("🔄 Attempting to initialize Supabase sequence generator...")
-                    self.generator = SupabaseSequenceGenerator()
-                    print("✅ Using Supabase sequence generator")
+                    logger.info("🔄 Attempting to initialize Supabase sequence generator...")
+                    generator = SupabaseSequenceGenerator()
+                    logger.info("✅ Using Supabase sequence generator")
                     
                     # Test the connection immediately
                     try:
-                        test_seq = self.generator.get_current_sequence_value('akdcah_seq')
-                        print(f"✅ Supabase connection test successful: akdcah_seq = {test_seq}")
+                        test_seq = generator.get_current_sequence_value('akdcah_seq')
+                        logger.info(f"✅ Supabase connection test successful: akdcah_seq = {test_seq}")
                     except Exception as test_error:
-                        print(f"❌ Supabase connection test failed: {test_error}")
+                        logger.error(f"❌ Supabase connection test failed: {test_error}")
                         raise test_error
                         
                 except Exception as sb_error:
-                    print(f"⚠️ Supabase unavailable ({type(sb_error).__name__}), using local sequence generator")
-                    print(f"   GitHub error: {gh_error}")
-                    print(f"   Google Sheets error: {gs_error}")
-                    print(f"   Supabase error: {sb_error}")
-                    self.generator = LocalSequenceGenerator()
-            
-        self.company_codes = {'AMOLAKCHAND': 'AK', 'BODEGA': 'BD', 'SOURCINGBEE': 'SB'}
-        self.facility_codes = {
-            'Sutlej/Gomati': 'SG', 
-            'Arihant': 'AH', 
-            'Vikrant': 'AH',
-            'FC-Hyderabad': 'HYD',  # Telangana facility
-            'Hyderabad': 'HYD'
-        }
+                    logger.warning(f"⚠️ Supabase unavailable ({type(sb_error).__name__}), using local sequence generator")
+                    logger.warning(f"   GitHub error: {gh_error}")
+                    logger.warning(f"   Google Sheets error: {gs_error}")
+                    logger.warning(f"   Supabase error: {sb_error}")
+                    generator = LocalSequenceGenerator()
         
-        # Hub codes for Telangana (extracted from HYD_XXX format)
-        self.telangana_hubs = ['BVG', 'SGR', 'BAL', 'KMP', 'NCH', 'SAN']
+        return generator
+    
+    def _next_sequence(self, sequence_name: str) -> int:
+        """Next number for a sequence, from the local block when one is cached"""
+        with self._sequence_lock:
+            next_value, end_value = self._sequence_cache.get(sequence_name, (1, 0))
+            if next_value > end_value:
+                if self.batch_size > 1:
+                    next_value = self.generator.get_next_sequence_batch(sequence_name, self.batch_size)
+                    end_value = next_value + self.batch_size - 1
+                else:
+                    next_value = end_value = self.generator.get_next_sequence(sequence_name)
+                self._current_cache[sequence_name] = (end_value, time.monotonic())
+            self._sequence_cache[sequence_name] = (next_value + 1, end_value)
+            return next_value
+    
+    def flush_cache(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Drop locally reserved numbers that were never handed out
         
-        # Add a reserved numbers cache for the two-step generation process
-        self.reserved_numbers = {}
+        Returns:
+            Dictionary of sequence name to unused (first, last) range
+        """
+        with self._sequence_lock:
+            unused = {name: (next_value, end_value)
+                      for name, (next_value, end_value) in self._sequence_cache.items()
+                      if next_value <= end_value}
+            self._sequence_cache.clear()
+        for name, (first, last) in unused.items():
+            logger.info(f"ℹ️ Unused reserved numbers for {name}: {first}-{last}")
+        return unused
     
     def _extract_hub_code(self, hub_value: str) -> str:
         """
@@ -205,12 +529,66 @@ class DCSequenceManager:
         if not hub_value or not isinstance(hub_value, str):
             return ''
         
-        # Extract the hub code after the underscore
-        parts = hub_value.split('_')
-        if len(parts) >= 2:
-            hub_code = parts[-1].upper()
-            return hub_code
-        return ''
+        # Extract the hub code after the last underscore ('3P_HYD_BVG' -> 'BVG');
+        # rpartition avoids building a list of every part
+        _, separator, hub_code = hub_value.rpartition('_')
+        return hub_code.upper() if separator else ''
+    
+    def _add_prefix(self, company_code: str, facility_code: str, hub_code: str) -> Tuple[str, str]:
+        """Register the interned (dc_template, sequence_name) for a code combination"""
+        prefix = f"{company_code}DC{facility_code}{hub_code}"
+        # The prefix is baked into a %-template: formatting then skips
+        # f-string format-spec parsing on every DC number
+        dc_template = sys.intern(prefix.replace('%', '%%') + "%06d")
+        sequence_name = sys.intern(f"{prefix.lower()}_seq")
+        resolved = self._seq_names[(company_code, facility_code, hub_code)] = (dc_template, sequence_name)
+        return resolved
+    
+    def _resolve_prefix(self, company_name: str, facility_name: str, hub_value: str = None) -> Tuple[str, str]:
+        """
+        Resolve the DC number template and sequence name for a company/facility/hub
+        
+        Results are memoized per input since only a handful of combinations occur.
+        
+        Returns:
+            Tuple of (dc_template, sequence_name), e.g. ('AKDCHYDNCH%06d', 'akdchydnch_seq');
+            dc_template % sequence gives the DC number with a 6-digit sequence
+            
+        Raises:
+            ValueError: If company_name is not one of company_codes
+        """
+        # Non-string hub values (None, NaN from pandas) all resolve like None;
+        # folding them keeps NaN, which never equals itself, out of the key
+        if not isinstance(hub_value, str):
+            hub_value = None
+        key = (company_name, facility_name, hub_value)
+        resolved = self._prefix_cache.get(key)
+        if resolved is not None:
+            return resolved
+        
+        company_code = self.company_codes.get(company_name.upper()) if isinstance(company_name, str) else None
+        if company_code is None:
+            raise ValueError(
+                f"Unknown company {company_name!r} for DC numbering; "
+                f"expected one of {', '.join(self.company_codes)}"
+            )
+        facility_code = self.facility_codes.get(facility_name, self.UNKNOWN_FACILITY_CODE)
+        
+        # Check if this is Telangana (Hyderabad) and hub tracking is needed
+        hub_code = ''
+        if facility_code == 'HYD' and hub_value:
+            # Use hub-specific sequence: akdchydnch_seq, bddchybal_seq, etc.
+            # Format: AKDCHYDNCH123456 (16 chars max: 10 prefix + 6 digits)
+            hub_code = self._extract_hub_code(hub_value)
+        
+        if hub_code in self.telangana_hubs or not hub_code:
+            resolved = self._seq_names[(company_code, facility_code, hub_code)]
+        else:
+            # A Telangana hub that is not in telangana_hubs yet
+            resolved = (self._seq_names.get((company_code, facility_code, hub_code))
+                        or self._add_prefix(company_code, facility_code, sys.intern(hub_code)))
+        self._prefix_cache[key] = resolved
+        return resolved
     
     def generate_dc_number(self, company_name: str, facility_name: str, hub_value: str = None) -> str:
         """
@@ -223,34 +601,20 @@ class DCSequenceManager:
             
         Returns:
             DC number in format: {Company}DC{Facility}{Sequence} or {Company}DC{Facility}{Hub}{Sequence}
+            
+        Raises:
+            ValueError: If company_name is not a known company
         """
-        company_code = self.company_codes.get(company_name.upper(), 'XX')
-        facility_code = self.facility_codes.get(facility_name, 'XX')
-        
-        # Check if this is Telangana (Hyderabad) and hub tracking is needed
-        if facility_code == 'HYD' and hub_value:
-            hub_code = self._extract_hub_code(hub_value)
-            if hub_code:
-                # Use hub-specific sequence: akdchydnch_seq, bddchybal_seq, etc.
-                # Format: AKDCHYDNCH123456 (16 chars max: 10 prefix + 6 digits)
-                prefix = f"{company_code}DC{facility_code}{hub_code}"
-                sequence_name = f"{prefix.lower()}_seq"
-                next_seq = self.generator.get_next_sequence(sequence_name)
-                return f"{prefix}{next_seq:06d}"  # 6 digits (1 to 999,999)
-        
-        # Default behavior for non-Telangana or when hub not provided
-        # Format: AKDCAH123456 (up to 14 chars: 6 prefix + 6 digits, leaves 2 spare)
-        prefix = f"{company_code}DC{facility_code}"
-        sequence_name = f"{prefix.lower()}_seq"
-        next_seq = self.generator.get_next_sequence(sequence_name)
-        return f"{prefix}{next_seq:06d}"  # 6 digits for consistency
+        dc_template, sequence_name = self._resolve_prefix(company_name, facility_name, hub_value)
+        next_seq = self._next_sequence(sequence_name)
+        return dc_template % next_seq  # 6 digits (1 to 999,999)
         
     def reserve_dc_number(self, company_name: str, facility_name: str, hub_value: str = None) -> str:
         """
         Reserve and immediately increment the DC number atomically.
         
         CHANGED: No longer uses a two-step reserve/confirm pattern because:
-        1. reserved_numbers cache is lost on Streamlit rerun (new instance)
+        1. An in-memory reservation cache is lost on Streamlit rerun (new instance)
         2. No way to guarantee confirmation is called
         3. Race conditions between reserve and confirm
         
@@ -263,68 +627,94 @@ class DCSequenceManager:
             
         Returns:
             New DC number (already incremented in Google Sheets/Supabase)
+            
+        Raises:
+            Exception: The backend error if the sequence could not be incremented;
+            no unsaved fallback number is issued, since it could duplicate one
         """
-        company_code = self.company_codes.get(company_name.upper(), 'XX')
-        facility_code = self.facility_codes.get(facility_name, 'XX')
-        
-        # Check if this is Telangana (Hyderabad) and hub tracking is needed
-        if facility_code == 'HYD' and hub_value:
-            hub_code = self._extract_hub_code(hub_value)
-            if hub_code:
-                prefix = f"{company_code}DC{facility_code}{hub_code}"
-                sequence_name = f"{prefix.lower()}_seq"
-            else:
-                prefix = f"{company_code}DC{facility_code}"
-                sequence_name = f"{prefix.lower()}_seq"
-        else:
-            prefix = f"{company_code}DC{facility_code}"
-            sequence_name = f"{prefix.lower()}_seq"
+        dc_template, sequence_name = self._resolve_prefix(company_name, facility_name, hub_value)
         
         # ATOMIC: Increment sequence immediately (no reservation needed)
         try:
-            next_seq = self.generator.get_next_sequence(sequence_name)
-            dc_number = f"{prefix}{next_seq:06d}"  # 6 digits to fit 16-char limit
-            print(f"✅ Generated DC number: {dc_number} (sequence incremented immediately)")
-            print(f"   Length: {len(dc_number)} chars (max 16)")
+            next_seq = self._next_sequence(sequence_name)
+            dc_number = dc_template % next_seq  # 6 digits to fit 16-char limit
+            logger.debug("✅ Generated DC number: %s (%d chars, max 16)", dc_number, len(dc_number))
             return dc_number
         except Exception as e:
-            print(f"❌ Failed to generate DC number: {e}")
-            # Fallback: use current + 1 (risky but better than crashing)
-            current_seq = self.get_current_sequence(sequence_name)
-            next_seq = current_seq + 1
-            dc_number = f"{prefix}{next_seq:06d}"
-            print(f"⚠️  Using fallback DC number: {dc_number} (NOT saved to database!)")
-            return dc_number
+            logger.error(f"❌ Failed to generate DC number: {e}")
+            raise
     
-    def confirm_dc_number(self, dc_number: str) -> bool:
+    def reserve_dc_numbers(self, requests: List[Tuple[str, str, Optional[str]]]) -> List[Optional[str]]:
         """
-        Confirm a previously reserved DC number, incrementing the sequence.
+        Reserve DC numbers for many DCs with one backend call per distinct sequence
         
         Args:
-            dc_number: The reserved DC number to confirm
+            requests: (company_name, facility_name, hub_value) for each DC
             
         Returns:
-            True if confirmation successful, False otherwise
-        """
-        if dc_number not in self.reserved_numbers:
-            print(f"❌ Cannot confirm DC number {dc_number} - not found in reservations")
-            return False
+            DC numbers in the same order as requests; None for a request whose
+            company is unknown, which is logged and reserves nothing
             
-        reservation = self.reserved_numbers[dc_number]
-        sequence_name = reservation['sequence_name']
+        Raises:
+            DCReservationError: If the backend failed after some sequences were
+                already advanced; the unused ranges are logged and attached
+        """
+        resolved = []
+        for request in requests:
+            try:
+                resolved.append(self._resolve_prefix(*request))
+            except ValueError as e:
+                logger.warning(f"⚠️ {e}")
+                resolved.append(None)
+        counts = Counter(sequence_name for _, sequence_name in filter(None, resolved))
+        if not counts:
+            return [None] * len(requests)
         
+        next_values = {}
         try:
-            # Now actually increment the sequence
-            next_seq = self.generator.get_next_sequence(sequence_name)
-            
-            # Clean up the reservation
-            del self.reserved_numbers[dc_number]
-            
-            print(f"✅ Confirmed DC number: {dc_number}")
-            return True
+            # Sheets (one batchUpdate) and GitHub (one commit) advance every counter at once
+            if hasattr(self.generator, 'get_next_sequence_batches'):
+                next_values = self.generator.get_next_sequence_batches(dict(counts))
+            else:
+                # Blocks first: a failed block reservation then burns no single numbers
+                for sequence_name, count in counts.items():
+                    if count > 1:
+                        next_values[sequence_name] = self.generator.get_next_sequence_batch(sequence_name, count)
+                singles = [sequence_name for sequence_name, count in counts.items() if count == 1]
+                # Supabase issues the single-number RPCs concurrently
+                if len(singles) > 1 and hasattr(self.generator, 'get_next_sequences'):
+                    next_values.update(zip(singles, self.generator.get_next_sequences(singles)))
+                else:
+                    for sequence_name in singles:
+                        next_values[sequence_name] = self.generator.get_next_sequence(sequence_name)
         except Exception as e:
-            print(f"❌ Failed to confirm DC number {dc_number}: {e}")
-            return False
+            reserved = {name: (first, first + counts[name] - 1) for name, first in next_values.items()}
+            reserved.update(getattr(e, 'reserved', {}))
+            if not reserved:
+                raise
+            for name, (first, last) in reserved.items():
+                logger.warning(f"⚠️ Reserved numbers never issued for {name}: {first}-{last}")
+            raise DCReservationError(
+                f"DC number reservation failed after advancing {len(reserved)} of {len(counts)} sequences: {e}",
+                reserved
+            ) from e
+        
+        now = time.monotonic()
+        for sequence_name, count in counts.items():
+            self._current_cache[sequence_name] = (next_values[sequence_name] + count - 1, now)
+        
+        # Hand out each block's numbers consecutively, in request order
+        dc_numbers = []
+        for prefix in resolved:
+            if prefix is None:
+                dc_numbers.append(None)
+                continue
+            dc_template, sequence_name = prefix
+            next_seq = next_values[sequence_name]
+            next_values[sequence_name] = next_seq + 1
+            dc_numbers.append(dc_template % next_seq)
+        logger.debug("✅ Reserved %d DC numbers across %d sequences", sum(counts.values()), len(counts))
+        return dc_numbers
     
     def get_current_sequence(self, sequence_name: str) -> int:
         """
@@ -336,24 +726,29 @@ class DCSequenceManager:
         Returns:
             Current sequence number
         """
-        if isinstance(self.generator, LocalSequenceGenerator):
-            # For local generator, we can access the sequences directly
-            return self.generator.sequences.get(sequence_name, 300)
-        else:
-            # For Supabase, use the proper RPC function that doesn't increment
-            try:
-                return self.generator.get_current_sequence_value(sequence_name)
-            except Exception as e:
-                print(f"⚠️ Error getting current sequence for {sequence_name}: {e}")
-                return 300  # Default fallback
+        cached = self._current_cache.get(sequence_name)
+        if cached is not None and time.monotonic() - cached[1] < self.CURRENT_CACHE_TTL:
+            return cached[0]
+        try:
+            value = self.generator.get_current_sequence_value(sequence_name)
+        except Exception as e:
+            logger.warning(f"⚠️ Error getting current sequence for {sequence_name}: {e}")
+            return 300  # Default fallback
+        self._current_cache[sequence_name] = (value, time.monotonic())
+        return value
     
     def get_current_sequences(self) -> dict:
         """Get all current sequence numbers"""
-        if isinstance(self.generator, LocalSequenceGenerator):
-            return self.generator.sequences
-        else:
-            # For Supabase, we'd need to implement this
-            return {}
+        sequences = self.generator.get_all_sequences()
+        now = time.monotonic()
+        self._current_cache.update((name, (value, now)) for name, value in sequences.items())
+        return sequences
+    
+    def get_cached_sequences(self) -> Dict[str, int]:
+        """Current values this process has seen within CURRENT_CACHE_TTL, without backend calls"""
+        now = time.monotonic()
+        return {name: value for name, (value, seen) in list(self._current_cache.items())
+                if now - seen < self.CURRENT_CACHE_TTL}
             
     def get_sequence_health_report(self) -> dict:
         """Get a health report on sequence status"""
@@ -364,21 +759,21 @@ class DCSequenceManager:
         }
         
         if isinstance(self.generator, LocalSequenceGenerator):
-            report['local_sequences'] = self.generator.sequences
+            # One consistent snapshot, so concurrent increments cannot make
+            # the stats disagree with the sequences shown
+            sequences = self.generator.get_all_sequences()
+            report['local_sequences'] = sequences
             
             # Calculate stats
-            sequences = list(self.generator.sequences.values())
-            if sequences:
-                report['max_sequence'] = max(sequences)
-                report['min_sequence'] = min(sequences)
-            else:
-                report['max_sequence'] = 0
-                report['min_sequence'] = 0
+            report['min_sequence'], report['max_sequence'] = _min_max(sequences.values())
+            if not sequences:
                 report['warnings'].append('No sequences found')
         else:
             report['local_sequences'] = {}
-            report['max_sequence'] = 0
-            report['min_sequence'] = 0
+            # Recently read or incremented values, served without a backend call
+            cached = self.get_cached_sequences()
+            report['cached_sequences'] = cached
+            report['min_sequence'], report['max_sequence'] = _min_max(cached.values())
             report['warnings'].append('Using Supabase - local sequences not available')
             
             # Add Supabase health check
@@ -395,4 +790,22 @@ class DCSequenceManager:
         
         return report
 
-dc_sequence_manager = DCSequenceManager() 
\ No newline at end of file
+
+# Singleton instance, created on first use rather than at import
+_dc_sequence_manager = None
+_dc_sequence_manager_lock = threading.Lock()
+
+
+def get_dc_sequence_manager() -> DCSequenceManager:
+    """
+    Get singleton DC sequence manager instance
+    
+    Returns:
+        DCSequenceManager instance
+    """
+    global _dc_sequence_manager
+    if _dc_sequence_manager is None:
+        with _dc_sequence_manager_lock:
+            if _dc_sequence_manager is None:
+                _dc_sequence_manager = DCSequenceManager()
+    return _dc_sequence_manager
@@ -4,16 +4,21 @@ DC Template Generator - Creates DCs in local Excel files with exact template for
 """
 
 import pandas as pd
+import copy
+import functools
+import io
 import os
 import sys
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-from openpyxl.utils import get_column_letter
+from openpyxl.styles.cell_style import StyleArray
 from openpyxl.worksheet.page import PageMargins # For setting margins
 from datetime import datetime
 import time
 import json # For state management
-from decimal import Decimal, ROUND_HALF_UP # For accurate financial calculations
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal # For accurate financial calculations
 import decimal # For handling decimal operations
 import re
 try:
@@ -34,6 +39,8 @@ except ImportError:
     subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'Pillow'])
     from PIL import Image as PILImage
 
+logger = logging.getLogger(__name__)
+
 # Output directory for generated DCs
 OUTPUT_DIR = "generated_dcs"
 INPUT_DIR = "input_data"
@@ -41,17 +48,22 @@ INPUT_DIR = "input_data"
 # Import dynamic configuration loader
 try:
     from .dynamic_hub_constants import get_dynamic_hub_constants, generate_hub_constants, generate_facility_mapping
+    from .dc_sequence_manager import get_dc_sequence_manager, DCReservationError
 except ImportError:
     # Fallback for standalone execution
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from core.dynamic_hub_constants import get_dynamic_hub_constants, generate_hub_constants, generate_facility_mapping
+    from core.dc_sequence_manager import get_dc_sequence_manager, DCReservationError
+
+# First 6-digit run in an address
+PINCODE_RE = re.compile(r'(\d{6})')
 
 # Hub-specific constants with dynamic hub metadata integration
 def extract_pincode_from_address(address):
     """Extract pincode from address string using regex"""
-    pincode_match = re.search(r'(\d{6})', address)
+    pincode_match = PINCODE_RE.search(address)
     return pincode_match.group(1) if pincode_match else '000000'  # Changed from hardcoded 562123
 
 # ✅ DYNAMIC CONFIGURATION: Generate hub constants from data files
@@ -65,27 +77,71 @@ FACILITY_ADDRESS_MAPPING = generate_facility_mapping()
 # --- State Management ---
 # REMOVED: Legacy sequence management - now using DCSequenceManager
 
+# --- Styles ---
+# Built once and shared by every DC; openpyxl copies style values into each
+# workbook's own style table, so sharing the objects is safe
+TITLE_FONT = Font(name='Calibri', size=14, bold=True)
+HEADER_FONT = Font(name='Calibri', size=11, bold=True)
+FOOTER_FONT = Font(name='Calibri', size=10, italic=True)
+BOLD_FONT = Font(bold=True)
+CENTER_ALIGNMENT = Alignment(horizontal='center', vertical='center', wrap_text=True)
+LEFT_ALIGNMENT = Alignment(horizontal='left', vertical='top', wrap_text=True)
+RIGHT_ALIGNMENT = Alignment(horizontal='right', vertical='center')
+CURRENCY_FORMAT = '₹ #,##0.00'
+
+THIN_SIDE = Side(style='thin')
+MEDIUM_SIDE = Side(style='medium')
+BOX_BORDER = Border(left=THIN_SIDE, right=THIN_SIDE, top=THIN_SIDE, bottom=THIN_SIDE)
+
+PRODUCT_HEADER_FILL = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+
+# Page margins in inches; never mutated, so every DC sheet shares this object
+PAGE_MARGINS = PageMargins(left=0.7, right=0.7, top=0.75, bottom=0.75, header=0.3, footer=0.3)
+
+COLUMN_WIDTHS = {'A': 15, 'B': 40, 'C': 15, 'D': 20, 'E': 15, 'F': 10, 'G': 12, 'H': 12, 'I': 15}
+
+# --- Static template layout ---
+# Header label cells (text written by populate_dc_data); the section headers are centred
+HEADER_LABEL_CELLS = ('A3', 'D3', 'A4', 'D4', 'A5', 'A6', 'A7', 'E7',
+                      'A8', 'E8', 'A9', 'E9', 'A10', 'E10', 'A11', 'E11',
+                      'A12', 'C12', 'E12', 'G12')
+SECTION_HEADER_CELLS = frozenset({'A7', 'E7'})
+
+# Sender (A8:A12, C12) and receiver (E8:E12, G12) labels
+DETAIL_LABEL_CELLS = tuple([f'A{i}' for i in range(8, 13)] + ['C12'] +
+                           [f'E{i}' for i in range(8, 13)] + ['G12'])
+
+# Alignment per column A-I: details data cells (sender B-D, receiver F-I) and product rows
+DETAIL_ALIGNMENTS = (None, LEFT_ALIGNMENT, LEFT_ALIGNMENT, LEFT_ALIGNMENT, None,
+                     LEFT_ALIGNMENT, LEFT_ALIGNMENT, LEFT_ALIGNMENT, LEFT_ALIGNMENT)
+PRODUCT_ALIGNMENTS = (RIGHT_ALIGNMENT,  # S.No.
+                      LEFT_ALIGNMENT,   # Product Description
+                      LEFT_ALIGNMENT) + (RIGHT_ALIGNMENT,) * 6  # HSN Code, numeric columns
+
+# Fixed merges of the template: title (A1:G1, narrowed from A1:I1 for the logo),
+# logo (H1:I1), section headers, then sender data B:D and receiver data F:I.
+# They are made up front, before any border is set: merging copies the top-left
+# cell's border onto the range edges, so the row-dependent totals/footer merges
+# stay in place after their borders.
+TEMPLATE_MERGES = ('A1:G1', 'H1:I1', 'A7:D7', 'E7:I7',
+                   'B8:D8', 'B9:D9', 'B10:D10', 'B11:D11',
+                   'F8:I8', 'F9:I9', 'F10:I10', 'F11:I11')
+
 def apply_formatting(ws, product_rows_count):
     """Apply visual formatting to the DC template using openpyxl."""
-    
-    # --- Define Styles ---
-    title_font = Font(name='Calibri', size=14, bold=True)
-    header_font = Font(name='Calibri', size=11, bold=True)
-    footer_font = Font(name='Calibri', size=10, italic=True)
-    bold_font = Font(bold=True)
-    center_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-    left_alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-    right_alignment = Alignment(horizontal='right', vertical='center')
-    currency_format = '₹ #,##0.00'
-    
-    thin_border_side = Side(style='thin')
-    box_border = Border(left=thin_border_side, right=thin_border_side, top=thin_border_side, bottom=thin_border_side)
-    
-    product_header_fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+    title_font = TITLE_FONT
+    header_font = HEADER_FONT
+    footer_font = FOOTER_FONT
+    bold_font = BOLD_FONT
+    center_alignment = CENTER_ALIGNMENT
+    left_alignment = LEFT_ALIGNMENT
+    right_alignment = RIGHT_ALIGNMENT
+    currency_format = CURRENCY_FORMAT
+    box_border = BOX_BORDER
+    product_header_fill = PRODUCT_HEADER_FILL
 
     # --- Column Widths ---
-    column_widths = {'A': 15, 'B': 40, 'C': 15, 'D': 20, 'E': 15, 'F': 10, 'G': 12, 'H': 12, 'I': 15}
-    for col, width in column_widths.items():
+    for col, width in COLUMN_WIDTHS.items():
         ws.column_dimensions[col].width = width
 
     # --- Row Heights (to better match the template) ---
@@ -100,44 +156,42 @@ def apply_formatting(ws, product_rows_count):
     ws.row_dimensions[13].height = 25 # Product table header
 
     # --- Merge Cells & Main Title ---
-    ws.merge_cells('A1:G1')  # Changed from A1:I1 to make room for logo
-    title_cell = ws['A1']
+    for cell_range in TEMPLATE_MERGES:
+        ws.merge_cells(cell_range)
+    title_cell = ws.cell(row=1, column=1)
     title_cell.value = "Delivery Challan"
     title_cell.font = title_font
     title_cell.alignment = center_alignment
     
-    # Merge cells for company logo
-    ws.merge_cells('H1:I1')
-    
     # Apply border to the merged A1:G1 range manually for robustness
-    thin_side = Side(style='thin')
-    for col_letter in "ABCDEFG":  # Changed from "ABCDEFGHI" to "ABCDEFG"
-        cell = ws[f'{col_letter}1']
+    thin_side = THIN_SIDE
+    for col_idx in range(1, 8):  # A-G, changed from A-I
+        cell = ws.cell(row=1, column=col_idx)
         
         # Get existing border to not overwrite other sides
         current_border = cell.border
         left = current_border.left
         right = current_border.right
         
-        if col_letter == 'A':
+        if col_idx == 1:  # A
             left = thin_side
-        if col_letter == 'G':  # Changed from 'I' to 'G'
+        if col_idx == 7:  # G, changed from I
             right = thin_side
             
         cell.border = Border(top=thin_side, bottom=thin_side, left=left, right=right)
     
     # Apply border to logo area H1:I1
-    for col_letter in "HI":
-        cell = ws[f'{col_letter}1']
+    for col_idx in (8, 9):  # H, I
+        cell = ws.cell(row=1, column=col_idx)
         
         # Get existing border to not overwrite other sides
         current_border = cell.border
         left = current_border.left
         right = current_border.right
         
-        if col_letter == 'H':
+        if col_idx == 8:
             left = thin_side
-        if col_letter == 'I':
+        if col_idx == 9:
             right = thin_side
             
         cell.border = Border(top=thin_side, bottom=thin_side, left=left, right=right)
@@ -146,64 +200,32 @@ def apply_formatting(ws, product_rows_count):
     add_company_logo(ws)
 
     # --- Static Headers Formatting ---
-    ws.merge_cells('A7:D7')
-    ws.merge_cells('E7:I7')
-    headers_info = {
-        'A3': "Serial no. of Challan:", 'D3': "Transport Mode:",
-        'A4': "Date of Challan:", 'D4': "Vehicle number:",
-        'A5': "Place of Supply :", 'A6': "State:",
-        'A7': "Details from Dispatch", 'E7': "Details of Receiver",
-        'A8': "Name:", 'E8': "Name:",
-        'A9': "Address:", 'E9': "Address:",
-        'A10': "GSTIN/UIN:", 'E10': "GSTIN/UIN:",
-        'A11': "FSSAI:", 'E11': "FSSAI:",
-        'A12': "State:", 'C12': "State Code:", 
-        'E12': "State:", 'G12': "State Code:"
-    }
-    for cell_ref, text in headers_info.items():
-        if ws[cell_ref].value:
-            ws[cell_ref].font = header_font
-            if cell_ref in ['A7', 'E7']:
-                 ws[cell_ref].alignment = center_alignment
-
-    # --- Sender & Receiver Details Formatting (Merging, Alignment, Borders) ---
+    for cell_ref in HEADER_LABEL_CELLS:
+        cell = ws[cell_ref]
+        if cell.value:
+            cell.font = header_font
+            if cell_ref in SECTION_HEADER_CELLS:
+                 cell.alignment = center_alignment
 
-    # Define the ranges for labels and data
-    sender_labels = [f'A{i}' for i in range(8, 13)] + ['C12']
-    receiver_labels = [f'E{i}' for i in range(8, 13)] + ['G12']
-    
-    sender_data_merges = {'B8': 'D8', 'B9': 'D9', 'B10': 'D10', 'B11': 'D11'}
-    receiver_data_merges = {'F8': 'I8', 'F9': 'I9', 'F10': 'I10', 'F11': 'I11'}
-
-    # Merge sender data cells
-    for start, end in sender_data_merges.items():
-        ws.merge_cells(f'{start}:{end}')
-        
-    # Merge receiver data cells
-    for start, end in receiver_data_merges.items():
-        ws.merge_cells(f'{start}:{end}')
+    # --- Sender & Receiver Details Formatting (Alignment, Borders) ---
 
     # Apply borders and alignment to the entire details section
-    # Loop through rows 7-12 and columns A-I to apply borders
-    for row in range(7, 13):
-        for col_idx in range(1, 10): # A=1, I=9
-            cell = ws.cell(row=row, column=col_idx)
+    # One pass over rows 7-12, columns A-I
+    for row in ws['A7:I12']:
+        # Apply alignment to data cells (rows 8 and below)
+        aligned = row[0].row > 7
+        for cell, alignment in zip(row, DETAIL_ALIGNMENTS):
             cell.border = box_border
-            # Apply alignment to data cells (rows 8 and below)
-            if row > 7:
-                col_letter = get_column_letter(col_idx)
-                # Data cells for sender (B, C, D) and receiver (F, G, H, I)
-                if col_letter in ['B', 'C', 'D', 'F', 'G', 'H', 'I']:
-                    cell.alignment = left_alignment
+            if aligned and alignment is not None:
+                cell.alignment = alignment
 
     # Re-apply bold font to all labels
-    for cell_ref in sender_labels + receiver_labels:
+    for cell_ref in DETAIL_LABEL_CELLS:
         ws[cell_ref].font = header_font
 
     # --- Product Table Header ---
     product_table_start_row = 13
-    product_header_cells = ws[f'A{product_table_start_row}:I{product_table_start_row}'][0]
-    for cell in product_header_cells:
+    for cell in next(ws.iter_rows(min_row=product_table_start_row, max_row=product_table_start_row, max_col=9)):
         cell.font = header_font
         cell.alignment = center_alignment
         cell.fill = product_header_fill
@@ -211,40 +233,46 @@ def apply_formatting(ws, product_rows_count):
         
     # --- Product Table Data & Totals Borders ---
     totals_row_index = product_table_start_row + product_rows_count
-    for row_idx in range(product_table_start_row + 1, totals_row_index + 1):
-        ws.row_dimensions[row_idx].height = 20 # Increased height for product rows
-        for col_idx in range(1, 10):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.border = box_border
-            if col_idx == 1: # S.No.
-                cell.alignment = right_alignment 
-            elif col_idx == 2: # Product Description
-                cell.alignment = left_alignment
-            elif col_idx == 3: # HSN Code
-                cell.alignment = left_alignment 
-            elif col_idx in [4, 5, 6, 7, 8, 9]: # Numeric columns
-                 cell.alignment = right_alignment
-    ws[f'A{totals_row_index}'].font = bold_font
+    # Every row gets the same border and per-column alignment. The border and
+    # alignment setters hash the style object to look up its index in the
+    # workbook on every call, so only the first row goes through them; later
+    # rows reuse its interned indices. Other style parts (e.g. number formats
+    # set while populating) are left alone.
+    column_style_ids = None
+    for row in ws.iter_rows(min_row=product_table_start_row + 1, max_row=totals_row_index, max_col=9):
+        ws.row_dimensions[row[0].row].height = 20 # Increased height for product rows
+        if column_style_ids is None:
+            for cell, alignment in zip(row, PRODUCT_ALIGNMENTS):
+                cell.border = box_border
+                cell.alignment = alignment
+            column_style_ids = [(cell._style.borderId, cell._style.alignmentId) for cell in row]
+        else:
+            for cell, (border_id, alignment_id) in zip(row, column_style_ids):
+                style = cell._style
+                # Not dead: openpyxl's StyleableObject leaves _style None until a
+                # cell is first styled, and cells written by ws.append have none yet
+                if style is None:
+                    style = cell._style = StyleArray()
+                style.borderId = border_id
+                style.alignmentId = alignment_id
 
     # --- Totals Row Specific Formatting ---
     ws.merge_cells(f'A{totals_row_index}:C{totals_row_index}')
-    total_label_cell = ws[f'A{totals_row_index}']
+    total_label_cell = ws.cell(row=totals_row_index, column=1)
     total_label_cell.font = bold_font
-    total_label_cell.alignment = Alignment(horizontal='right', vertical='center')
+    total_label_cell.alignment = right_alignment
     
-    # Apply currency format to totals
-    ws[f'E{totals_row_index}'].number_format = currency_format
-    ws[f'G{totals_row_index}'].number_format = currency_format
-    ws[f'H{totals_row_index}'].number_format = currency_format
-    ws[f'I{totals_row_index}'].number_format = currency_format
+    # Apply currency format to totals (E, G, H, I)
+    for col_idx in (5, 7, 8, 9):
+        ws.cell(row=totals_row_index, column=col_idx).number_format = currency_format
 
     # --- Footer Section Formatting ---
     footer_start_row = totals_row_index + 1
     # Total in words
     ws.merge_cells(f'A{footer_start_row}:H{footer_start_row}')
-    ws[f'A{footer_start_row}'].font = bold_font
+    ws.cell(row=footer_start_row, column=1).font = bold_font
     
-    grand_total_cell = ws[f'I{footer_start_row}']
+    grand_total_cell = ws.cell(row=footer_start_row, column=9)
     grand_total_cell.font = bold_font
     grand_total_cell.alignment = right_alignment
     grand_total_cell.number_format = currency_format
@@ -252,49 +280,46 @@ def apply_formatting(ws, product_rows_count):
     # Certification text
     footer_row_cert = footer_start_row + 1
     ws.merge_cells(f'A{footer_row_cert}:I{footer_row_cert}')
-    ws[f'A{footer_row_cert}'].font = footer_font
-    ws[f'A{footer_row_cert}'].alignment = left_alignment
+    cert_cell = ws.cell(row=footer_row_cert, column=1)
+    cert_cell.font = footer_font
+    cert_cell.alignment = left_alignment
     
     # Reasons for transportation
     footer_row_reasons = footer_start_row + 2
     ws.merge_cells(f'A{footer_row_reasons}:D{footer_row_reasons}')
     ws.merge_cells(f'E{footer_row_reasons}:I{footer_row_reasons}')
-    ws[f'E{footer_row_reasons}'].font = bold_font
-    ws[f'E{footer_row_reasons}'].alignment = center_alignment
+    company_cell = ws.cell(row=footer_row_reasons, column=5)
+    company_cell.font = bold_font
+    company_cell.alignment = center_alignment
     
     # Terms and Conditions
     footer_row_terms = footer_start_row + 4 # Row 86 relative to totals
     ws.merge_cells(f'A{footer_row_terms}:I{footer_row_terms+2}') # Assuming it spans 3 rows
-    ws[f'A{footer_row_terms}'].alignment = left_alignment
+    ws.cell(row=footer_row_terms, column=1).alignment = left_alignment
 
     # Signatures
     footer_row_sig = footer_start_row + 7 # Row 89 relative to totals
     ws.merge_cells(f'E{footer_row_sig}:I{footer_row_sig}')
-    ws[f'E{footer_row_sig}'].alignment = center_alignment
+    ws.cell(row=footer_row_sig, column=5).alignment = center_alignment
 
     # --- Page Setup for Printing ---
     # Calculate the last row of content
     last_content_row = totals_row_index + 8
 
-    # Apply a thick outer border to the entire print area
-    medium_side = Side(style='medium')
-    for row in ws.iter_rows(min_row=1, max_row=last_content_row, min_col=1, max_col=9):
-        for cell in row:
-            # Start with a copy of the cell's existing border
-            new_border = Border(left=cell.border.left,
-                                  right=cell.border.right,
-                                  top=cell.border.top,
-                                  bottom=cell.border.bottom)
-            # Apply the medium border to the edges of the print area
-            if cell.row == 1:
-                new_border.top = medium_side
-            if cell.row == last_content_row:
-                new_border.bottom = medium_side
-            if cell.column == 1:
-                new_border.left = medium_side
-            if cell.column == 9:
-                new_border.right = medium_side
-            cell.border = new_border
+    # Apply a thick outer border to the entire print area; interior cells
+    # keep their borders, so only the perimeter is visited
+    medium_side = MEDIUM_SIDE
+    for row_idx in range(1, last_content_row + 1):
+        is_top = row_idx == 1
+        is_bottom = row_idx == last_content_row
+        for col_idx in (range(1, 10) if is_top or is_bottom else (1, 9)):
+            cell = ws.cell(row=row_idx, column=col_idx)
+            # Keep the cell's existing sides, medium on the print area's edges
+            border = cell.border
+            cell.border = Border(left=medium_side if col_idx == 1 else border.left,
+                                 right=medium_side if col_idx == 9 else border.right,
+                                 top=medium_side if is_top else border.top,
+                                 bottom=medium_side if is_bottom else border.bottom)
 
     ws.print_area = f'A1:I{last_content_row}'  # Define the print area
     ws.page_setup.orientation = ws.ORIENTATION_PORTRAIT
@@ -306,8 +331,32 @@ def apply_formatting(ws, product_rows_count):
     # Product table header is on row 13
     ws.print_title_rows = '13:13' 
 
-    # Set page margins (values are in inches)
-    ws.page_margins = PageMargins(left=0.7, right=0.7, top=0.75, bottom=0.75, header=0.3, footer=0.3)
+    # Set page margins
+    ws.page_margins = PAGE_MARGINS
+
+
+@functools.lru_cache(maxsize=4096)
+def _paise_in_words(paise):
+    return num2words(paise / 100, to='currency', lang='en_IN', currency='INR').title()
+
+def rupees_in_words(amount):
+    """
+    Amount in Indian-currency words, e.g. 'Three Hundred And Thirty-Five Rupees, Forty-Five Paise'
+    
+    Cached by the amount in paise, since a batch of DCs repeats many totals.
+    
+    Args:
+        amount: Rupee amount (Decimal or float) rounded to paise
+    """
+    return _paise_in_words(int(round(amount * 100)))
+
+
+def _div_half_up(numerator, denominator):
+    """Integer division rounding half away from zero, like ROUND_HALF_UP (denominator > 0)"""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
 
 
 def create_dc_template(ws, product_data_start_row):
@@ -338,43 +387,41 @@ def populate_dc_data(ws, dc_data):
     # If facility_state not available, fallback to hub_state
     if not facility_state:
         facility_state = dc_data.get('hub_state', '')
-        print(f"⚠️  Facility state not found, using hub state: {facility_state}")
+        logger.warning("⚠️  Facility state not found, using hub state: %s", facility_state)
     
     # Dynamic lookup with actual state for correct GSTIN
     if facility_state:
         from .dynamic_hub_constants import get_dynamic_hub_constants
         dhc = get_dynamic_hub_constants()
         hub_details = dhc.get_hub_constants(hub_key, state=facility_state, fc_name=facility_name)
-        print(f"✅ Using DYNAMIC hub constants for {hub_key} in {facility_state}")
-        print(f"   Facility: {facility_name}")
-        print(f"   GSTIN: {hub_details.get('sender_gstin', 'N/A')}")
+        logger.debug("✅ Using DYNAMIC hub constants for %s in %s (facility: %s, GSTIN: %s)",
+                     hub_key, facility_state, facility_name, hub_details.get('sender_gstin', 'N/A'))
     else:
         # Fallback to static if state not available
         hub_details = HUB_CONSTANTS.get(hub_key, {})
-        print(f"⚠️  Using STATIC hub constants for {hub_key} (state not available)")
+        logger.warning("⚠️  Using STATIC hub constants for %s (state not available)", hub_key)
 
     # ✅ CITY-AGNOSTIC: Use dynamic hub data if available, no hardcoded fallbacks
     place_of_supply = dc_data.get('place_of_supply', hub_details.get('place_of_supply', ''))
     hub_state = dc_data.get('hub_state', hub_details.get('state', ''))
     hub_state_code = dc_data.get('hub_state_code', hub_details.get('state_code', ''))
     
-    print(f"🏢 DC Template using dynamic data:")
-    print(f"   Place of Supply: {place_of_supply}")
-    print(f"   Hub State: {hub_state} ({hub_state_code})")
+    logger.debug("🏢 DC Template using dynamic data: place of supply %s, hub state %s (%s)",
+                 place_of_supply, hub_state, hub_state_code)
 
     # CRITICAL FIX: Use dynamic facility address instead of hardcoded address
     facility_name = dc_data.get('facility_name', 'Unknown')
     if dc_data.get('facility_address'):
         # Use facility-specific address from DC data
         sender_address = dc_data['facility_address']
-        print(f"🏢 DC Template: Using facility-specific address for {facility_name}")
-        print(f"   Address: {sender_address}")
+        logger.debug("🏢 DC Template: Using facility-specific address for %s: %s",
+                     facility_name, sender_address)
     else:
         # Fallback to hardcoded address
         sender_address = hub_details.get('sender_address', '')
-        print(f"⚠️ DC Template: Using fallback address (facility address not available)")
-        print(f"   Available DC fields: {list(dc_data.keys())}")
-        print(f"   facility_address: {dc_data.get('facility_address', 'MISSING')}")
+        logger.warning("⚠️ DC Template: Using fallback address for %s (facility address not available)",
+                       facility_name)
+        logger.debug("   Available DC fields: %s", list(dc_data))
 
     # --- Populate Header ---
     headers_info = {
@@ -403,107 +450,122 @@ def populate_dc_data(ws, dc_data):
     # --- Populate Products ---
     product_data_start_row = 14
     current_row = product_data_start_row
-    total_qty = Decimal('0')
-    total_taxable_value = Decimal('0')
-    total_cgst = Decimal('0')
-    total_sgst = Decimal('0')
-    total_cess = Decimal('0')
+    products = dc_data['products']
     
-    # Define a Decimal for rounding to two places
-    TWO_PLACES = Decimal('0.01')
-
-    for idx, product in enumerate(dc_data['products'], 1):
-        value = product['Value'] # This is already a Decimal
-        gst_rate = Decimal(str(product['GST Rate']))
-        
-        cgst_amount = (value * gst_rate * Decimal('0.5') / Decimal('100')).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
-        sgst_amount = cgst_amount 
-        
-        # CESS CALCULATION FIX: The 'Cess' field contains CESS RATE, not amount
-        # CESS Amount = (CESS Rate × Taxable Value) / 100
-        cess_rate = product['Cess']  # This is the CESS rate (e.g., 12.0%)
-        cess_amount = (cess_rate * value / Decimal('100')).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
-        
-        ws.cell(row=current_row, column=1, value=idx)
-        ws.cell(row=current_row, column=2, value=product['Description'])
-        ws.cell(row=current_row, column=3, value=product['HSN'])
-        # Convert Decimals back to float for openpyxl if needed, or keep as string
-        ws.cell(row=current_row, column=4, value=float(product['Quantity']))
-        ws.cell(row=current_row, column=5, value=float(value))
-        ws.cell(row=current_row, column=6, value=float(gst_rate))
-        ws.cell(row=current_row, column=7, value=float(cgst_amount))
-        ws.cell(row=current_row, column=8, value=float(sgst_amount))
-        ws.cell(row=current_row, column=9, value=float(cess_amount))
-        
-        total_qty += Decimal(str(product['Quantity']))
-        total_taxable_value += value
-        total_cgst += cgst_amount
-        total_sgst += sgst_amount
-        total_cess += cess_amount
-        current_row += 1
+    # Amounts are integer paise, rounded half-up as on the GST invoice. Value
+    # (already a Decimal in paise) and the rates are turned into exact integer
+    # ratios once, so each tax is one integer multiply and one rounded division:
+    # CGST = value × rate / 200, CESS = value × cess rate / 100 (in rupees)
+    gst_rates = [Decimal(str(product['GST Rate'])) for product in products]
+    value_ratios = [product['Value'].as_integer_ratio() for product in products]
+    values_paise = [_div_half_up(num * 100, den) for num, den in value_ratios]
+    cgst_paise = [_div_half_up(value_num * rate_num, value_den * rate_den * 2)
+                  for (value_num, value_den), (rate_num, rate_den)
+                  in zip(value_ratios, (rate.as_integer_ratio() for rate in gst_rates))]
+    # CESS CALCULATION FIX: The 'Cess' field contains CESS RATE, not amount
+    # CESS Amount = (CESS Rate × Taxable Value) / 100
+    cess_paise = [_div_half_up(value_num * rate_num, value_den * rate_den)
+                  for (value_num, value_den), (rate_num, rate_den)
+                  in zip(value_ratios, (Decimal(str(product['Cess'])).as_integer_ratio()
+                                        for product in products))]
+
+    # Product and totals rows are built as plain lists (columns A-I) and
+    # appended whole; rows 1-13 are already filled, so ws.append starts at
+    # product_data_start_row. Paise become float rupees only here.
+    rows = [[idx, product['Description'], product['HSN'], float(product['Quantity']),
+             value / 100, float(gst_rate), cgst_amount / 100,
+             cgst_amount / 100,  # SGST equals CGST
+             cess_amount / 100]
+            for idx, (product, value, gst_rate, cgst_amount, cess_amount) in enumerate(
+                zip(products, values_paise, gst_rates, cgst_paise, cess_paise), 1)]
+    
+    total_qty = sum(Decimal(str(product['Quantity'])) for product in products)
+    total_taxable_value = sum(values_paise)
+    total_cgst = total_sgst = sum(cgst_paise)
+    total_cess = sum(cess_paise)
         
     # --- Populate Totals Row ---
-    ws.cell(row=current_row, column=1, value="Total")
-    ws.cell(row=current_row, column=4, value=float(total_qty))
-    ws.cell(row=current_row, column=5, value=float(total_taxable_value))
-    ws.cell(row=current_row, column=7, value=float(total_cgst))
-    ws.cell(row=current_row, column=8, value=float(total_sgst))
-    ws.cell(row=current_row, column=9, value=float(total_cess))
+    rows.append({1: "Total", 4: float(total_qty), 5: total_taxable_value / 100,
+                 7: total_cgst / 100, 8: total_sgst / 100, 9: total_cess / 100})
+    for row in rows:
+        ws.append(row)
+    current_row += len(products)
     
     product_rows_count = current_row - product_data_start_row
     
     # --- Footer Section ---
     footer_start_row = current_row + 1
-    grand_total = (total_taxable_value + total_cgst + total_sgst + total_cess).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+    grand_total_paise = total_taxable_value + total_cgst + total_sgst + total_cess
+    grand_total = grand_total_paise / 100
     
-    # Debug print to see the actual value
-    print(f"DEBUG - grand_total: {grand_total} (type: {type(grand_total)})")
-    
-    # Convert grand_total to float and ensure it's a valid number before passing to num2words
     try:
-        # First convert to string to handle Decimal objects properly
-        grand_total_str = str(grand_total)
-        grand_total_float = float(grand_total_str)
-        amount_in_words = num2words(grand_total_float, to='currency', lang='en_IN', currency='INR').title()
+        amount_in_words = _paise_in_words(grand_total_paise)
     except (ValueError, decimal.InvalidOperation) as e:
-        print(f"Warning: Could not convert amount to words: {e}")
+        logger.warning("Could not convert amount to words: %s", e)
         amount_in_words = "Amount conversion error"
     
-    ws[f'A{footer_start_row}'] = f"Total in Words: {amount_in_words} Only"
-    ws[f'I{footer_start_row}'] = float(grand_total)
+    ws.cell(row=footer_start_row, column=1, value=f"Total in Words: {amount_in_words} Only")
+    ws.cell(row=footer_start_row, column=9, value=grand_total)
 
     # Row 83 equivalent
-    ws[f'A{footer_start_row+1}'] = "Certified that the particulars given above are true and correct"
+    ws.cell(row=footer_start_row + 1, column=1, value="Certified that the particulars given above are true and correct")
 
     # Row 84 equivalent
-    ws[f'A{footer_start_row+2}'] = "Reasons for transportation other than by way of supply: Intrastate Stock transfer between units of same entity"
-    ws[f'E{footer_start_row+2}'] = hub_details['company_name']
+    ws.cell(row=footer_start_row + 2, column=1, value="Reasons for transportation other than by way of supply: Intrastate Stock transfer between units of same entity")
+    ws.cell(row=footer_start_row + 2, column=5, value=hub_details['company_name'])
     
     # Row 86 equivalent
-    ws[f'A{footer_start_row+4}'] = "Terms & Conditions"
+    ws.cell(row=footer_start_row + 4, column=1, value="Terms & Conditions")
     
     # Row 89 equivalent
-    ws[f'A{footer_start_row+7}'] = "Signature of Receiver"
-    ws[f'E{footer_start_row+7}'] = "Authorised signatory"
+    ws.cell(row=footer_start_row + 7, column=1, value="Signature of Receiver")
+    ws.cell(row=footer_start_row + 7, column=5, value="Authorised signatory")
 
     return product_rows_count + 1 # Include totals row for formatting
 
-def create_dc_excel(dc_data_item):
-    """Create a new DC Excel workbook, populate, format, and save it."""
+def save_workbook(wb, file_path):
+    """
+    Save a workbook with a single file write, atomically
+    
+    openpyxl's ZipFile issues many small writes; the workbook is serialized to
+    memory instead, written to a temporary file in the same directory and
+    renamed into place, so a crash never leaves a truncated .xlsx behind.
+    """
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def create_dc_excel(dc_data_item, dc_number=None):
+    """
+    Create a new DC Excel workbook, populate, format, and save it.
+    
+    Args:
+        dc_data_item: DC data dictionary
+        dc_number: DC number already reserved for this DC; generated here if None
+    """
     try:
         wb = Workbook()
         ws = wb.active
         
         # Use new DC sequence manager instead of legacy state
-        try:
-            from .dc_sequence_manager import dc_sequence_manager
-            hub_key = dc_data_item.get('hub_type')
-            facility_name = dc_data_item.get('facility_name', 'Arihant')  # Default to Arihant
-            dc_number = dc_sequence_manager.generate_dc_number(hub_key, facility_name)
-            print(f"✅ Generated new format DC number: {dc_number}")
-        except Exception as e:
-            print(f"❌ Error generating new format DC: {e}")
-            dc_number = "LEGACY_DC_001"  # Fallback
+        if dc_number is None:
+            try:
+                dc_sequence_manager = get_dc_sequence_manager()
+                hub_key = dc_data_item.get('hub_type')
+                facility_name = dc_data_item.get('facility_name', 'Arihant')  # Default to Arihant
+                dc_number = dc_sequence_manager.generate_dc_number(hub_key, facility_name)
+                logger.debug("✅ Generated new format DC number: %s", dc_number)
+            except Exception as e:
+                print(f"❌ Error generating new format DC: {e}")
+                dc_number = "LEGACY_DC_001"  # Fallback
         
         ws.title = f"DC_{dc_number}"
 
@@ -524,12 +586,9 @@ def create_dc_excel(dc_data_item):
         # Include trip_ref_number in the filename for better identification
         trip_ref_number = dc_data_item.get('trip_ref_number', '').replace(',', '')  # Remove commas from trip_ref_number
         file_path = os.path.join(OUTPUT_DIR, f"{ws.title}_Trip{trip_ref_number}.xlsx")
-        wb.save(file_path)
-        
-        # Clean up temporary logo files
-        cleanup_temp_files(ws)
+        save_workbook(wb, file_path)
         
-        print(f"✅ Created and Formatted DC: {dc_number} for Trip {trip_ref_number} at {file_path}")
+        logger.debug("✅ Created and Formatted DC: %s for Trip %s at %s", dc_number, trip_ref_number, file_path)
         return True
         
     except Exception as e:
@@ -560,42 +619,57 @@ def read_dc_data(input_file=None):
         print(f"❌ Error reading DC data: {str(e)}")
         return None
 
+@functools.lru_cache(maxsize=4)
+def _logo_image(logo_path, target_width=120, target_height=30):
+    """
+    Logo resized to fit target_width x target_height, as an openpyxl image
+    
+    Prepared once per process: the file check, PIL open and LANCZOS resize
+    run for the first DC only. The returned image is a template for
+    add_company_logo to copy, never added to a worksheet itself.
+    
+    Returns:
+        ExcelImage over an in-memory PNG, or None if the logo file is missing
+    """
+    if not os.path.exists(logo_path):
+        return None
+    
+    with PILImage.open(logo_path) as img:
+        # Calculate scaling to maintain aspect ratio
+        original_ratio = img.width / img.height
+        if target_width / target_height > original_ratio:
+            # Height is the limiting factor
+            new_height = target_height
+            new_width = int(target_height * original_ratio)
+        else:
+            # Width is the limiting factor
+            new_width = target_width
+            new_height = int(target_width / original_ratio)
+        
+        # Resize image
+        resized_img = img.resize((new_width, new_height), PILImage.Resampling.LANCZOS)
+    
+    buffer = io.BytesIO()
+    resized_img.save(buffer, 'PNG')
+    return ExcelImage(buffer)
+
 def add_company_logo(ws, logo_path="/Users/jumbotail/Desktop/e-way bill /image.png"):
     """Add company logo to the Excel template in cells H1:I1"""
     try:
-        if not os.path.exists(logo_path):
-            print(f"⚠️ Logo file not found at {logo_path}")
+        # Calculate ideal size for H1:I1 cells (approximately 120x30 pixels for Excel)
+        # Excel column width is roughly 64 pixels for standard width
+        # H1:I1 spans 2 columns, so about 128 pixels width
+        # Row height is about 20 pixels for standard height
+        logo_template = _logo_image(logo_path)
+        if logo_template is None:
+            logger.warning("⚠️ Logo file not found at %s", logo_path)
             return False
         
-        # Create a resized version of the logo in memory
-        with PILImage.open(logo_path) as img:
-            # Calculate ideal size for H1:I1 cells (approximately 120x30 pixels for Excel)
-            # Excel column width is roughly 64 pixels for standard width
-            # H1:I1 spans 2 columns, so about 128 pixels width
-            # Row height is about 20 pixels for standard height
-            target_width = 120
-            target_height = 30
-            
-            # Calculate scaling to maintain aspect ratio
-            original_ratio = img.width / img.height
-            if target_width / target_height > original_ratio:
-                # Height is the limiting factor
-                new_height = target_height
-                new_width = int(target_height * original_ratio)
-            else:
-                # Width is the limiting factor
-                new_width = target_width
-                new_height = int(target_width / original_ratio)
-            
-            # Resize image
-            resized_img = img.resize((new_width, new_height), PILImage.Resampling.LANCZOS)
-            
-            # Save to temporary file that will persist until Excel saves
-            temp_logo_path = f"temp_logo_resized_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png"
-            resized_img.save(temp_logo_path, 'PNG')
-        
-        # Add image to Excel
-        logo_img = ExcelImage(temp_logo_path)
+        # Copy the prepared image (size and format are already known); openpyxl
+        # reads (and closes) the stream when the workbook is saved, so each
+        # image gets its own buffer
+        logo_img = copy.copy(logo_template)
+        logo_img.ref = io.BytesIO(logo_template.ref.getvalue())
         
         # Position the image in H1 (Excel coordinates start at 1,1)
         logo_img.anchor = 'H1'
@@ -603,12 +677,7 @@ def add_company_logo(ws, logo_path="/Users/jumbotail/Desktop/e-way bill /image.p
         # Add to worksheet
         ws.add_image(logo_img)
         
-        # Store temp file path for cleanup later
-        if not hasattr(ws, '_temp_files'):
-            ws._temp_files = []
-        ws._temp_files.append(temp_logo_path)
-        
-        print("✅ Company logo added successfully")
+        logger.debug("✅ Company logo added successfully")
         return True
         
     except Exception as e:
@@ -617,28 +686,28 @@ def add_company_logo(ws, logo_path="/Users/jumbotail/Desktop/e-way bill /image.p
         traceback.print_exc()
         return False
 
-def cleanup_temp_files(ws):
-    """Clean up temporary files created during logo insertion"""
-    try:
-        if hasattr(ws, '_temp_files'):
-            for temp_file in ws._temp_files:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-                    print(f"🧹 Cleaned up temporary file: {temp_file}")
-            ws._temp_files = []
-    except Exception as e:
-        print(f"⚠️ Warning: Could not clean up temporary files: {str(e)}")
-
 def get_hub_pincode_from_address(hub_address):
     """Extract pincode from hub address"""
     if not hub_address:
         return '000000'  # ✅ CITY-AGNOSTIC: Changed from hardcoded 562123
     
-    pincode_match = re.search(r'(\d{6})', hub_address)
+    pincode_match = PINCODE_RE.search(hub_address)
     return pincode_match.group(1) if pincode_match else '000000'  # ✅ CITY-AGNOSTIC: Changed from hardcoded 562123
 
+PROGRESS_INTERVAL = 100
+
+def _report_progress(results, total):
+    """Consume create_dc_excel results, printing progress every PROGRESS_INTERVAL DCs"""
+    created = 0
+    for done, ok in enumerate(results, 1):
+        created += bool(ok)
+        if done % PROGRESS_INTERVAL == 0 or done == total:
+            print(f"📄 {done}/{total} DCs processed ({created} created)")
+
 def main():
     """Main entry point"""
+    # Per-DC detail is logged at DEBUG, so batch runs only report progress
+    logging.basicConfig(level=logging.INFO)
     try:
         print("🚀 Starting DC generation (Local Excel)...")
         
@@ -655,9 +724,33 @@ def main():
         # Create output directory if it doesn't exist
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         
-        # Generate DCs using new sequence manager
-        for dc_data in dc_data_list:
-            create_dc_excel(dc_data)  # No longer need to pass state
+        # Reserve every DC number here, in one process: worker processes
+        # each get their own sequence manager and must not issue numbers
+        try:
+            dc_numbers = get_dc_sequence_manager().reserve_dc_numbers([
+                (dc_data.get('hub_type'), dc_data.get('facility_name', 'Arihant'), None)
+                for dc_data in dc_data_list
+            ])
+        except DCReservationError as e:
+            # Issuing fresh numbers now would skip the logged ranges silently
+            print(f"❌ {e}; no DCs generated")
+            return
+        except Exception as e:
+            # Nothing was reserved, so numbering each DC as it is built leaves no gap
+            print(f"⚠️ Could not reserve DC numbers up front ({e}); generating DCs one by one")
+            results = map(create_dc_excel, dc_data_list)
+            _report_progress(results, len(dc_data_list))
+        else:
+            jobs = [(dc_data, dc_number) for dc_data, dc_number in zip(dc_data_list, dc_numbers)
+                    if dc_number is not None]
+            failed = len(dc_data_list) - len(jobs)
+            if failed:
+                print(f"❌ {failed} DCs failed: company could not be resolved for DC numbering")
+            if jobs:
+                # Each workbook is independent CPU-bound work, so build them in parallel
+                with ProcessPoolExecutor() as executor:
+                    results = executor.map(create_dc_excel, *zip(*jobs), chunksize=8)
+                    _report_progress(results, len(jobs))
             
         print("✅ DC generation complete!")
         
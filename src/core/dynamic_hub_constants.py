@@ -6,15 +6,47 @@ Replaces hardcoded HUB_CONSTANTS with data-driven configuration
 
 import sys
 import os
+from types import MappingProxyType
 from typing import Dict, Optional
 
 # Handle both module import and standalone execution
 try:
-    from .config_loader import get_config_loader
+    from .config_loader import get_config_loader, normalize_company_name
 except ImportError:
     # Add parent directory to path for standalone execution
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from core.config_loader import get_config_loader
+    from core.config_loader import get_config_loader, normalize_company_name
+
+
+# Per-company display name, legacy DC prefix and new-format company code
+COMPANY_NAMES = MappingProxyType({
+    'SOURCINGBEE': 'SourcingBee Private Limited',
+    'AMOLAKCHAND': 'Amolakchand Ankur Kothari Enterprises Private Limited',
+    'BODEGA': 'Bodega Retail Private Limited'
+})
+DC_PREFIXES = MappingProxyType({
+    'SOURCINGBEE': 'SBDCMYR',
+    'AMOLAKCHAND': 'AKVHDCMYR',
+    'BODEGA': 'BDVHDCMYR'
+})
+COMPANY_CODES = MappingProxyType({
+    'SOURCINGBEE': 'SB',
+    'AMOLAKCHAND': 'AK',
+    'BODEGA': 'BD'
+})
+
+# Facility code by keyword found in the FC name, highest priority first
+FACILITY_CODE_KEYWORDS = {
+    'Arihant': 'AH', 'Vikrant': 'AH',
+    'Sutlej': 'SG', 'Gomati': 'SG',
+    'Patna': 'PTN',
+    'Ranchi': 'RNC',
+    'Lucknow': 'LKO',
+    'Hyderabad': 'HYD',
+    'Pune': 'PUN',
+    'Ahmedabad': 'AMD',
+    'Bhubaneswar': 'BHU',
+}
 
 
 class DynamicHubConstants:
@@ -27,6 +59,15 @@ class DynamicHubConstants:
         """Initialize with configuration loader"""
         self.config = get_config_loader()
         self._constants_cache = {}
+        # Whole-table results, built on first use
+        self._all_constants = None
+        self._facility_mapping = None
+    
+    def cache_clear(self):
+        """Drop all cached constants, e.g. after the configuration was reloaded"""
+        self._constants_cache.clear()
+        self._all_constants = None
+        self._facility_mapping = None
         
     def get_hub_constants(self, company: str, state: Optional[str] = None, fc_name: Optional[str] = None) -> Dict:
         """
@@ -41,37 +82,25 @@ class DynamicHubConstants:
             Dictionary with hub constants (compatible with old HUB_CONSTANTS format)
         """
         # Normalize company name
-        company = company.upper().strip()
-        if 'SOURCINGBEE' in company or 'SOURCING BEE' in company:
-            company = 'SOURCINGBEE'
-        elif 'AMOLAKCHAND' in company:
-            company = 'AMOLAKCHAND'
-        elif 'BODEGA' in company:
-            company = 'BODEGA'
+        company = normalize_company_name(company)
             
         # Check cache
         cache_key = (company, state, fc_name)
         if cache_key in self._constants_cache:
             return self._constants_cache[cache_key]
             
-        # Get company states
+        # Get company states and FCs
         states = self.config.get_company_states(company)
-        if not states:
-            return self._get_fallback_constants(company)
-            
-        # Use provided state or first available state
-        target_state = state if state else states[0]
-        
-        # Get company FCs
-        fcs = self.config.get_company_fcs(company)
+        fcs = self.config.get_company_fcs(company) if states else None
         if not fcs:
-            return self._get_fallback_constants(company)
+            constants = self._get_fallback_constants(company)
+        else:
+            # Use provided state/FC or the first available one
+            target_state = state if state else states[0]
+            target_fc = fc_name if fc_name else fcs[0]
             
-        # Use provided FC or first available FC
-        target_fc = fc_name if fc_name else fcs[0]
-        
-        # Build constants
-        constants = self._build_constants(company, target_state, target_fc)
+            # Build constants
+            constants = self._build_constants(company, target_state, target_fc)
         
         # Cache and return
         self._constants_cache[cache_key] = constants
@@ -89,28 +118,13 @@ class DynamicHubConstants:
         state_code = self.config.get_state_code(state)
         
         # Determine company display name
-        company_names = {
-            'SOURCINGBEE': 'SourcingBee Private Limited',
-            'AMOLAKCHAND': 'Amolakchand Ankur Kothari Enterprises Private Limited',
-            'BODEGA': 'Bodega Retail Private Limited'
-        }
-        company_name = company_names.get(company, company)
+        company_name = COMPANY_NAMES.get(company, company)
         
         # Determine DC prefix (legacy format)
-        dc_prefixes = {
-            'SOURCINGBEE': 'SBDCMYR',
-            'AMOLAKCHAND': 'AKVHDCMYR',
-            'BODEGA': 'BDVHDCMYR'
-        }
-        dc_prefix = dc_prefixes.get(company, f'{company[:2]}DCMYR')
+        dc_prefix = DC_PREFIXES.get(company, f'{company[:2]}DCMYR')
         
         # Determine company code (new format)
-        company_codes = {
-            'SOURCINGBEE': 'SB',
-            'AMOLAKCHAND': 'AK',
-            'BODEGA': 'BD'
-        }
-        company_code = company_codes.get(company, company[:2])
+        company_code = COMPANY_CODES.get(company, company[:2])
         
         # Extract city from FC info or state
         city = fc_info.get('state', state) if fc_info else state
@@ -134,15 +148,11 @@ class DynamicHubConstants:
         
     def _get_fallback_constants(self, company: str) -> Dict:
         """Get fallback constants when no data available"""
-        company_names = {
-            'SOURCINGBEE': 'SourcingBee Private Limited',
-            'AMOLAKCHAND': 'Amolakchand Ankur Kothari Enterprises Private Limited',
-            'BODEGA': 'Bodega Retail Private Limited'
-        }
+        company_name = COMPANY_NAMES.get(company, company)
         
         return {
-            'company_name': company_names.get(company, company),
-            'sender_name': company_names.get(company, company),
+            'company_name': company_name,
+            'sender_name': company_name,
             'sender_address': '',
             'sender_gstin': '',
             'state': '',
@@ -158,7 +168,12 @@ class DynamicHubConstants:
         """
         Get all hub constants for all companies
         Returns dictionary compatible with old HUB_CONSTANTS format
+        
+        Built once and cached (see cache_clear)
         """
+        if self._all_constants is not None:
+            return self._all_constants
+        
         all_constants = {}
         
         for company in self.config.get_all_companies():
@@ -170,13 +185,19 @@ class DynamicHubConstants:
                 constants = self.get_hub_constants(company, states[0], fcs[0])
                 all_constants[company] = constants
                 
+        self._all_constants = all_constants
         return all_constants
         
     def get_facility_address_mapping(self) -> Dict[str, Dict]:
         """
         Get facility address mapping for all FCs
         Returns dictionary compatible with old FACILITY_ADDRESS_MAPPING format
+        
+        Built once and cached (see cache_clear)
         """
+        if self._facility_mapping is not None:
+            return self._facility_mapping
+        
         mapping = {}
         
         for company in self.config.get_all_companies():
@@ -195,32 +216,17 @@ class DynamicHubConstants:
                         'state': fc_info.get('state', '')
                     }
                     
+        self._facility_mapping = mapping
         return mapping
         
     def _get_facility_code(self, fc_name: str) -> str:
         """Extract facility code from FC name"""
-        # Common patterns
-        if 'Arihant' in fc_name or 'Vikrant' in fc_name:
-            return 'AH'
-        elif 'Sutlej' in fc_name or 'Gomati' in fc_name:
-            return 'SG'
-        elif 'Patna' in fc_name:
-            return 'PTN'
-        elif 'Ranchi' in fc_name:
-            return 'RNC'
-        elif 'Lucknow' in fc_name:
-            return 'LKO'
-        elif 'Hyderabad' in fc_name:
-            return 'HYD'
-        elif 'Pune' in fc_name:
-            return 'PUN'
-        elif 'Ahmedabad' in fc_name:
-            return 'AMD'
-        elif 'Bhubaneswar' in fc_name:
-            return 'BHU'
-        else:
-            # Default: use first 2-3 chars
-            return fc_name[:3].upper()
+        # Common patterns; the first keyword in table order wins, wherever it appears in the name
+        for keyword, code in FACILITY_CODE_KEYWORDS.items():
+            if keyword in fc_name:
+                return code
+        # Default: use first 2-3 chars
+        return fc_name[:3].upper()
 
 
 # Singleton instance
@@ -5,12 +5,44 @@ BEST ALTERNATIVE FOR STREAMLIT CLOUD - No quota limits, version controlled
 """
 
 import os
+import copy
 import json
 import base64
 import requests
+import threading
 import time
 from typing import Dict
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout for GitHub API calls, in seconds
+GITHUB_TIMEOUT = (3.05, 10)
+
+_github_session = None
+_github_session_lock = threading.Lock()
+
+def get_github_session() -> requests.Session:
+    """
+    Shared keep-alive session for GitHub API calls
+    
+    Reusing pooled connections saves a TCP+TLS handshake per call. Reads are
+    retried by urllib3 on rate limiting and server errors; writes are not, as
+    a failed PUT is retried with a fresh SHA by the callers.
+    """
+    global _github_session
+    if _github_session is None:
+        with _github_session_lock:
+            if _github_session is None:
+                retry = Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods=frozenset({'GET'}),
+                              raise_on_status=False)
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                                      max_retries=retry))
+                _github_session = session
+    return _github_session
 
 class GitHubSequenceGenerator:
     """
@@ -41,9 +73,17 @@ class GitHubSequenceGenerator:
             'Accept': 'application/vnd.github.v3+json',
             'Content-Type': 'application/json'
         }
+        self.session = get_github_session()
+        
+        # (content, sha) as of this instance's last successful commit; lets the
+        # next increment skip the GET. Dropped whenever a commit fails (e.g. a
+        # 409 because another writer moved the file on)
+        self._cached = None
         
-        # Initialize or verify sequence file exists
-        self._initialize_sequence_file()
+        # The sequence file is verified (or created) on first use rather than
+        # here, so constructing the generator makes no network call
+        self._initialized = False
+        self._init_lock = threading.Lock()
         
         print("✅ GitHub sequence generator initialized successfully")
         print(f"   Repository: {self.github_repo}")
@@ -100,7 +140,7 @@ class GitHubSequenceGenerator:
         try:
             url = f"{self.api_base}/repos/{self.github_repo}/contents/{self.sequence_file_path}"
             params = {'ref': self.github_branch}
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params, timeout=GITHUB_TIMEOUT)
             
             if response.status_code == 200:
                 data = response.json()
@@ -140,20 +180,32 @@ class GitHubSequenceGenerator:
             
             # Make API request
             url = f"{self.api_base}/repos/{self.github_repo}/contents/{self.sequence_file_path}"
-            response = requests.put(url, headers=self.headers, json=commit_data)
+            response = self.session.put(url, headers=self.headers, json=commit_data, timeout=GITHUB_TIMEOUT)
             
             if response.status_code in [200, 201]:
                 print(f"✅ Successfully committed to GitHub: {message}")
+                # The response carries the new blob SHA, so the file we just
+                # wrote is known without reading it back
+                try:
+                    self._cached = (content, response.json()['content']['sha'])
+                except (ValueError, KeyError, TypeError):
+                    self._cached = None
                 return True
             else:
                 print(f"❌ Failed to commit to GitHub: {response.status_code}")
                 print(f"   Response: {response.text}")
+                self._cached = None
                 return False
                 
         except Exception as e:
             print(f"❌ Error committing to GitHub: {e}")
+            self._cached = None
             return False
     
+    def invalidate_cache(self):
+        """Forget the cached file, so the next increment reads it from GitHub"""
+        self._cached = None
+    
     def _initialize_sequence_file(self):
         """Initialize sequence file if it doesn't exist"""
         try:
@@ -180,10 +232,42 @@ class GitHubSequenceGenerator:
                 print("✅ Sequence file initialized in GitHub")
             else:
                 print("✅ Sequence file exists in GitHub")
+                self._cached = (content, sha)
         except Exception as e:
             print(f"❌ Error initializing sequence file: {e}")
             raise
     
+    def _ensure_initialized(self) -> bool:
+        """
+        Verify or create the sequence file on the first call
+        
+        Raises if GitHub is unreachable or the credentials are rejected.
+        
+        Returns:
+            True if this call did the check, leaving the file it read or
+            wrote in the cache
+        """
+        if self._initialized:
+            return False
+        with self._init_lock:
+            if self._initialized:
+                return False
+            self._initialize_sequence_file()
+            self._initialized = True
+            return True
+    
+    def _read_file(self, fresh: bool) -> tuple:
+        """Sequence file (content, sha), from the cache when fresh (just initialized)"""
+        cached = self._cached
+        if fresh and cached is not None:
+            return cached
+        content, sha = self._get_file_from_github()
+        if content is not None:
+            # A read is usually followed by an increment: let it start from
+            # this read instead of fetching the file again
+            self._cached = (content, sha)
+        return content, sha
+    
     def get_next_sequence(self, sequence_name: str, retry_count: int = 5) -> int:
         """
         Get next sequence value (increments atomically with retry logic)
@@ -195,45 +279,106 @@ class GitHubSequenceGenerator:
         Returns:
             Next sequence number
         """
+        return self._increment(sequence_name, 1, retry_count)
+    
+    def get_next_sequence_batch(self, sequence_name: str, batch_size: int, retry_count: int = 5) -> int:
+        """
+        Reserve batch_size consecutive sequence values with a single commit
+        
+        Args:
+            sequence_name: Name of sequence (e.g., 'akdcah_seq')
+            batch_size: Number of values to reserve
+            retry_count: Number of retries on conflict
+            
+        Returns:
+            First reserved number (the block ends at first + batch_size - 1)
+        """
+        return self._increment(sequence_name, batch_size, retry_count) - batch_size + 1
+    
+    def get_next_sequence_batches(self, counts: Dict[str, int], retry_count: int = 5) -> Dict[str, int]:
+        """
+        Reserve blocks for several sequences with a single commit
+        
+        All counters live in the one sequence file, so a single contents-API
+        PUT advances every sequence of a DC run atomically.
+        
+        Args:
+            counts: Sequence name -> number of values to reserve
+            retry_count: Number of retries on conflict
+            
+        Returns:
+            Sequence name -> first reserved number of its block
+        """
+        new_values = self._increment_many(counts, retry_count)
+        return {name: new_values[name] - count + 1 for name, count in counts.items()}
+    
+    def _increment(self, sequence_name: str, step: int, retry_count: int) -> int:
+        """Advance a sequence by step and return its new value"""
+        return self._increment_many({sequence_name: step}, retry_count)[sequence_name]
+    
+    def _increment_many(self, steps: Dict[str, int], retry_count: int) -> Dict[str, int]:
+        """Advance each sequence by its step in one commit and return the new values"""
+        self._ensure_initialized()
+        # (name, step, history key), built once for all attempts
+        updates = [(sequence_name, step, sequence_name + '_history')
+                   for sequence_name, step in steps.items()]
         for attempt in range(retry_count):
+            # Start from the file as last committed here, if known; a stale
+            # copy just fails the commit's SHA check and is re-read below.
+            # Each call works on its own copy of the cached content.
+            cached = self._cached
             try:
                 # Get current file
-                content, sha = self._get_file_from_github()
+                if cached is not None:
+                    content, sha = copy.deepcopy(cached[0]), cached[1]
+                else:
+                    content, sha = self._get_file_from_github()
                 
                 if content is None:
                     raise Exception("Sequence file not found in GitHub")
                 
-                # Get current sequence value
                 sequences = content.get('sequences', {})
-                current_value = sequences.get(sequence_name, 300)
-                
-                # Calculate next value
-                next_value = current_value + 1
+                timestamp = datetime.now().isoformat()
+                new_values = {}
+                changes = []
+                for sequence_name, step, history_key in updates:
+                    # Get current sequence value and calculate next value
+                    current_value = sequences.get(sequence_name, 300)
+                    next_value = current_value + step
+                    sequences[sequence_name] = next_value
+                    new_values[sequence_name] = next_value
+                    changes.append(f"{sequence_name}: {current_value} → {next_value}")
+                    
+                    history = content.setdefault(history_key, [])
+                    history.append({
+                        'value': next_value,
+                        'timestamp': timestamp
+                    })
+                    # Keep only last 10 history entries (trimmed in place)
+                    if len(history) > 10:
+                        del history[:-10]
                 
                 # Update content
-                sequences[sequence_name] = next_value
                 content['sequences'] = sequences
-                content['last_updated'] = datetime.now().isoformat()
-                content[f'{sequence_name}_history'] = content.get(f'{sequence_name}_history', [])
-                content[f'{sequence_name}_history'].append({
-                    'value': next_value,
-                    'timestamp': datetime.now().isoformat()
-                })
-                # Keep only last 10 history entries
-                content[f'{sequence_name}_history'] = content[f'{sequence_name}_history'][-10:]
+                content['last_updated'] = timestamp
                 
                 # Commit to GitHub
-                message = f"Increment {sequence_name}: {current_value} → {next_value}"
+                summary = ", ".join(changes)
+                message = f"Increment {summary}"
                 success = self._commit_file_to_github(content, sha, message)
                 
                 if success:
-                    print(f"✅ Incremented {sequence_name}: {current_value} → {next_value}")
-                    return next_value
+                    print(f"✅ Incremented {summary}")
+                    return new_values
                 else:
                     raise Exception("Failed to commit to GitHub")
                     
             except Exception as e:
-                if attempt < retry_count - 1:
+                self._cached = None
+                if cached is not None and attempt < retry_count - 1:
+                    # Most likely a stale cache, not contention: re-read right away
+                    print(f"⚠️ Retry {attempt + 1}/{retry_count} with a fresh read: {e}")
+                elif attempt < retry_count - 1:
                     wait_time = (attempt + 1) * 0.5  # Exponential backoff
                     print(f"⚠️ Retry {attempt + 1}/{retry_count} after {wait_time}s: {e}")
                     time.sleep(wait_time)
@@ -251,8 +396,11 @@ class GitHubSequenceGenerator:
         Returns:
             Current sequence number
         """
+        # Outside the try: on the first call this raises when GitHub is
+        # unusable, which the sequence manager's backend probe relies on
+        fresh = self._ensure_initialized()
         try:
-            content, _ = self._get_file_from_github()
+            content, _ = self._read_file(fresh)
             
             if content is None:
                 return 300  # Default value
@@ -267,12 +415,12 @@ class GitHubSequenceGenerator:
     def get_all_sequences(self) -> Dict[str, int]:
         """Get all sequences as a dictionary"""
         try:
-            content, _ = self._get_file_from_github()
+            content, _ = self._read_file(self._ensure_initialized())
             
             if content is None:
                 return {}
             
-            return content.get('sequences', {})
+            return dict(content.get('sequences', {}))
             
         except Exception as e:
             print(f"⚠️ Error getting all sequences: {e}")
@@ -302,7 +450,8 @@ class GitHubSequenceGenerator:
             content['sequences'] = sequences
             content['last_updated'] = datetime.now().isoformat()
             
-            # Commit
+            # Commit (a successful commit re-primes the cache)
+            self.invalidate_cache()
             message = f"Set {sequence_name} = {value} (manual update)"
             success = self._commit_file_to_github(content, sha, message)
             
@@ -7,10 +7,39 @@ Only runs in cloud environments (Streamlit Cloud)
 import os
 import json
 import base64
-import requests
+import functools
 from datetime import datetime
 from typing import Dict, Optional
 
+from .github_sequence_generator import GITHUB_TIMEOUT, get_github_session
+
+# Environment variables set by Streamlit Cloud and other hosting platforms
+CLOUD_ENV_VARS = (
+    # Streamlit Cloud
+    'STREAMLIT_CLOUD',
+    'STREAMLIT_SHARING',
+    'STREAMLIT_SERVER_PORT',
+    'STREAMLIT_SERVER_ADDRESS',
+    # Other cloud platforms
+    'HEROKU',
+    'RENDER',
+    'RAILWAY',
+    'VERCEL',
+    'NETLIFY'
+)
+LOCAL_ADDRESSES = ('localhost', '127.0.0.1')
+
+
+@functools.cache
+def is_cloud_environment() -> bool:
+    """Detect if we're running in a cloud environment (checked once per process)"""
+    environ = os.environ
+    if any(environ.get(name) for name in CLOUD_ENV_VARS):
+        return True
+    # Check if running on a remote server (not localhost)
+    return environ.get('STREAMLIT_SERVER_ADDRESS', 'localhost') not in LOCAL_ADDRESSES
+
+
 class GitHubSequenceSync:
     """Sync sequence state changes back to GitHub repository"""
     
@@ -30,6 +59,7 @@ class GitHubSequenceSync:
             'Authorization': f'token {self.github_token}',
             'Accept': 'application/vnd.github.v3+json'
         } if self.github_token else {}
+        self.session = get_github_session()
         
         # Enable/disable based on environment and configuration
         self.enabled = self.is_cloud and bool(self.github_token and self.github_repo)
@@ -46,44 +76,13 @@ class GitHubSequenceSync:
     
     def _detect_cloud_environment(self) -> bool:
         """Detect if we're running in a cloud environment"""
-        # Streamlit Cloud indicators
-        streamlit_cloud_indicators = [
-            'STREAMLIT_CLOUD',
-            'STREAMLIT_SHARING',
-            'STREAMLIT_SERVER_PORT',
-            'STREAMLIT_SERVER_ADDRESS'
-        ]
-        
-        # Check for any Streamlit Cloud indicators
-        for indicator in streamlit_cloud_indicators:
-            if os.getenv(indicator):
-                return True
-        
-        # Check for other cloud platforms
-        other_cloud_indicators = [
-            'HEROKU',
-            'RENDER',
-            'RAILWAY',
-            'VERCEL',
-            'NETLIFY'
-        ]
-        
-        for indicator in other_cloud_indicators:
-            if os.getenv(indicator):
-                return True
-        
-        # Check if running on a remote server (not localhost)
-        server_address = os.getenv('STREAMLIT_SERVER_ADDRESS', 'localhost')
-        if server_address != 'localhost' and server_address != '127.0.0.1':
-            return True
-        
-        return False
+        return is_cloud_environment()
     
     def get_file_sha(self) -> Optional[str]:
         """Get the current SHA of the sequence file on GitHub"""
         try:
             url = f"{self.api_base}/repos/{self.github_repo}/contents/{self.sequence_file_path}"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers, timeout=GITHUB_TIMEOUT)
             
             if response.status_code == 200:
                 return response.json()['sha']
@@ -136,7 +135,7 @@ class GitHubSequenceSync:
             
             # Make API request
             url = f"{self.api_base}/repos/{self.github_repo}/contents/{self.sequence_file_path}"
-            response = requests.put(url, headers=self.headers, json=commit_data)
+            response = self.session.put(url, headers=self.headers, json=commit_data, timeout=GITHUB_TIMEOUT)
             
             if response.status_code == 200:
                 print(f"✅ Successfully synced sequence state to GitHub")
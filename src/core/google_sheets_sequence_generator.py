@@ -6,10 +6,13 @@ Works perfectly with Streamlit Cloud (no ephemeral filesystem issues)
 
 import os
 import json
-from typing import Dict
+from typing import Dict, List
 from datetime import datetime
+import threading
 import time
 
+from .backoff import backoff_delay
+
 try:
     import gspread
     from google.oauth2.service_account import Credentials
@@ -57,6 +60,10 @@ class GoogleSheetsSequenceGenerator:
         self.spreadsheet_id = self._get_or_create_spreadsheet()
         self.worksheet = self._get_or_create_worksheet()
         
+        # The Sheets values API has no conditional (compare-and-set) write, so
+        # read-modify-write cycles from this process are at least serialized
+        self._write_lock = threading.Lock()
+        
         print("✅ Google Sheets sequence generator initialized successfully")
     
     def _get_credentials(self) -> dict:
@@ -173,63 +180,103 @@ class GoogleSheetsSequenceGenerator:
         Returns:
             Next sequence number
         """
-        for attempt in range(retry_count):
-            try:
-                # Find the row for this sequence
-                all_values = self.worksheet.get_all_values()
-                
-                row_index = None
+        return self._increment(sequence_name, 1, retry_count)
+    
+    def get_next_sequence_batch(self, sequence_name: str, batch_size: int, retry_count: int = 3) -> int:
+        """
+        Reserve batch_size consecutive sequence values with one read and one write
+        
+        Args:
+            sequence_name: Name of sequence (e.g., 'akdcah_seq')
+            batch_size: Number of values to reserve
+            retry_count: Number of retries on conflict
+            
+        Returns:
+            First reserved number (the block ends at first + batch_size - 1)
+        """
+        return self._increment(sequence_name, batch_size, retry_count) - batch_size + 1
+    
+    def get_next_sequence_batches(self, counts: Dict[str, int], retry_count: int = 3) -> Dict[str, int]:
+        """
+        Reserve blocks for several sequences with one read and one batched write
+        
+        Args:
+            counts: Sequence name -> number of values to reserve
+            retry_count: Number of retries on conflict
+            
+        Returns:
+            Sequence name -> first reserved number of its block
+        """
+        new_values = self._increment_many(counts, retry_count)
+        return {name: new_values[name] - count + 1 for name, count in counts.items()}
+    
+    def _increment(self, sequence_name: str, step: int, retry_count: int) -> int:
+        """Advance a sequence by step and return its new value"""
+        return self._increment_many({sequence_name: step}, retry_count)[sequence_name]
+    
+    def _increment_many(self, steps: Dict[str, int], retry_count: int) -> Dict[str, int]:
+        """Advance each sequence by its step and return the new values"""
+        with self._write_lock:
+            for attempt in range(retry_count):
+                try:
+                    return self._increment_many_unlocked(steps)
+                except Exception as e:
+                    if attempt < retry_count - 1:
+                        # Jittered so sessions hitting the same quota error spread out
+                        wait_time = backoff_delay(attempt, e, base=0.5)
+                        print(f"⚠️ Retry {attempt + 1}/{retry_count} after {wait_time:.2f}s: {e}")
+                        time.sleep(wait_time)
+                    else:
+                        print(f"❌ Failed after {retry_count} attempts: {e}")
+                        raise
+    
+    def _increment_many_unlocked(self, steps: Dict[str, int]) -> Dict[str, int]:
+        """One read plus one values.batchUpdate write; caller holds _write_lock"""
+        all_values = self.worksheet.get_all_values()
+        
+        # First row per sequence name wins (skip header)
+        rows = {}
+        for idx, row in enumerate(all_values[1:], start=2):
+            if row:
+                rows.setdefault(row[0], idx)
+        
+        timestamp = datetime.now().isoformat()
+        next_row = len(all_values) + 1
+        updates = []
+        new_values = {}
+        for sequence_name, step in steps.items():
+            row_index = rows.get(sequence_name)
+            if row_index:
+                # Update existing row
+                existing_row = all_values[row_index-1]
+                current_value = int(existing_row[1]) if existing_row[1] else 300
+                # Safely get the increment count (handle rows with fewer than 4 columns)
+                increment_count = 1
+                if len(existing_row) > 3 and existing_row[3]:
+                    try:
+                        increment_count = int(existing_row[3]) + 1
+                    except (ValueError, TypeError):
+                        increment_count = 1
+                next_value = current_value + step
+                updates.append({
+                    'range': f'B{row_index}:D{row_index}',
+                    'values': [[next_value, timestamp, increment_count]]
+                })
+            else:
+                # Insert new row
                 current_value = 300  # Default starting value
-                
-                # Search for existing sequence
-                for idx, row in enumerate(all_values[1:], start=2):  # Skip header
-                    if row and row[0] == sequence_name:
-                        row_index = idx
-                        current_value = int(row[1]) if row[1] else 300
-                        break
-                
-                # Calculate next value
-                next_value = current_value + 1
-                
-                # Update or insert
-                if row_index:
-                    # Update existing row
-                    # Safely get the increment count (handle rows with fewer than 4 columns)
-                    existing_row = all_values[row_index-1]
-                    increment_count = 1
-                    if len(existing_row) > 3 and existing_row[3]:
-                        try:
-                            increment_count = int(existing_row[3]) + 1
-                        except (ValueError, TypeError):
-                            increment_count = 1
-                    
-                    update_range = f'B{row_index}:D{row_index}'
-                    update_values = [[next_value, datetime.now().isoformat(), increment_count]]
-                    print(f"🔄 Updating Google Sheets: {update_range} = {update_values}")
-                    
-                    result = self.worksheet.update(update_range, update_values)
-                    print(f"✅ Google Sheets update result: {result}")
-                else:
-                    # Insert new row
-                    next_row = len(all_values) + 1
-                    update_range = f'A{next_row}:D{next_row}'
-                    update_values = [[sequence_name, next_value, datetime.now().isoformat(), 1]]
-                    print(f"🔄 Inserting new row in Google Sheets: {update_range} = {update_values}")
-                    
-                    result = self.worksheet.update(update_range, update_values)
-                    print(f"✅ Google Sheets insert result: {result}")
-                
-                print(f"✅ Incremented {sequence_name}: {current_value} → {next_value}")
-                return next_value
-                
-            except Exception as e:
-                if attempt < retry_count - 1:
-                    wait_time = 0.5 * (attempt + 1)
-                    print(f"⚠️ Retry {attempt + 1}/{retry_count} after {wait_time}s: {e}")
-                    time.sleep(wait_time)
-                else:
-                    print(f"❌ Failed after {retry_count} attempts: {e}")
-                    raise
+                next_value = current_value + step
+                updates.append({
+                    'range': f'A{next_row}:D{next_row}',
+                    'values': [[sequence_name, next_value, timestamp, 1]]
+                })
+                next_row += 1
+            new_values[sequence_name] = next_value
+            print(f"🔄 Incrementing {sequence_name}: {current_value} → {next_value}")
+        
+        result = self.worksheet.batch_update(updates)
+        print(f"✅ Google Sheets batch update result: {result}")
+        return new_values
     
     def get_current_sequence_value(self, sequence_name: str) -> int:
         """
@@ -256,17 +303,33 @@ class GoogleSheetsSequenceGenerator:
             print(f"⚠️ Error getting current sequence for {sequence_name}: {e}")
             return 300
     
+    def batch_read(self, sequence_names: List[str] = None) -> Dict[str, int]:
+        """
+        Read sequence values with a single Sheets API call
+        
+        Args:
+            sequence_names: Sequences to return (all sequences if None)
+            
+        Returns:
+            Dictionary of sequence name to current value; requested names
+            missing from the sheet get the default starting value
+        """
+        # Only the name/value columns are needed
+        (values,) = self.worksheet.batch_get(['A:B'])
+        
+        sequences = {}
+        for row in values[1:]:  # Skip header
+            if row and len(row) >= 2 and row[0]:
+                sequences[row[0]] = int(row[1]) if row[1] else 300
+        
+        if sequence_names is None:
+            return sequences
+        return {name: sequences.get(name, 300) for name in sequence_names}
+    
     def get_all_sequences(self) -> Dict[str, int]:
         """Get all sequences as a dictionary"""
         try:
-            all_values = self.worksheet.get_all_values()
-            
-            sequences = {}
-            for row in all_values[1:]:  # Skip header
-                if row and len(row) >= 2 and row[0]:
-                    sequences[row[0]] = int(row[1]) if row[1] else 300
-            
-            return sequences
+            return self.batch_read()
             
         except Exception as e:
             print(f"⚠️ Error getting all sequences: {e}")
@@ -284,30 +347,31 @@ class GoogleSheetsSequenceGenerator:
             True if successful
         """
         try:
-            all_values = self.worksheet.get_all_values()
+            with self._write_lock:
+                all_values = self.worksheet.get_all_values()
             
-            row_index = None
-            for idx, row in enumerate(all_values[1:], start=2):
-                if row and row[0] == sequence_name:
-                    row_index = idx
-                    break
+                row_index = None
+                for idx, row in enumerate(all_values[1:], start=2):
+                    if row and row[0] == sequence_name:
+                        row_index = idx
+                        break
             
-            if row_index:
-                # Update existing
-                self.worksheet.update(f'B{row_index}:D{row_index}', [[
-                    value,
-                    datetime.now().isoformat(),
-                    '(manually set)'
-                ]])
-            else:
-                # Insert new
-                next_row = len(all_values) + 1
-                self.worksheet.update(f'A{next_row}:D{next_row}', [[
-                    sequence_name,
-                    value,
-                    datetime.now().isoformat(),
-                    '(manually set)'
-                ]])
+                if row_index:
+                    # Update existing
+                    self.worksheet.update(f'B{row_index}:D{row_index}', [[
+                        value,
+                        datetime.now().isoformat(),
+                        '(manually set)'
+                    ]])
+                else:
+                    # Insert new
+                    next_row = len(all_values) + 1
+                    self.worksheet.update(f'A{next_row}:D{next_row}', [[
+                        sequence_name,
+                        value,
+                        datetime.now().isoformat(),
+                        '(manually set)'
+                    ]])
             
             print(f"✅ Set {sequence_name} = {value}")
             return True
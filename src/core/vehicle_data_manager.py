@@ -11,6 +11,7 @@ from decimal import Decimal, ROUND_HALF_UP
 import json
 import decimal
 import re
+from collections.abc import Mapping
 import numpy as np
 from .hub_metadata_service import hub_metadata
 
@@ -849,7 +850,7 @@ class VehicleDataManager:
             
             # Get facility address information with debugging
             facility_address = self.get_facility_address(facility_name, company=hub_type)
-            if isinstance(facility_address, dict) and 'address' in facility_address:
+            if isinstance(facility_address, Mapping) and 'address' in facility_address:
                 print(f"   Facility address: {facility_address['address'][:50]}...")
                 print(f"   Facility pincode: {facility_address.get('pincode', 'Not found')}")
             else:
@@ -1009,8 +1010,9 @@ class VehicleDataManager:
         
         print(f"🏢 Split DC using company name: {company_name} (hub_type: {hub_type})")
         
-        # Ensure facility_address is a dictionary with required keys
-        if not isinstance(facility_address, dict):
+        # Ensure facility_address is a mapping with required keys (config
+        # loader addresses are read-only MappingProxyType views)
+        if not isinstance(facility_address, Mapping):
             facility_address = self.default_facility_address
         
         # Safe access to facility address components with fallbacks
@@ -11,17 +11,11 @@ from openpyxl import Workbook
 from datetime import datetime
 import json
 from decimal import Decimal, ROUND_HALF_UP
-try:
-    from num2words import num2words
-except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'num2words'])
-    from num2words import num2words
 
 # Import existing formatting functions
 from .dc_template_generator import (
     apply_formatting, create_dc_template, 
-    HUB_CONSTANTS, add_company_logo, cleanup_temp_files
+    HUB_CONSTANTS, add_company_logo, rupees_in_words, save_workbook
 )
 
 # Import e-way bill generation components
@@ -183,32 +177,28 @@ def populate_vehicle_dc_data(ws, dc_data):
     # Debug print to see the actual value
     print(f"DEBUG - grand_total: {grand_total} (type: {type(grand_total)})")
     
-    # Convert grand_total to float and ensure it's a valid number before passing to num2words
     try:
-        # First convert to string to handle Decimal objects properly
-        grand_total_str = str(grand_total)
-        grand_total_float = float(grand_total_str)
-        amount_in_words = num2words(grand_total_float, to='currency', lang='en_IN', currency='INR').title()
+        amount_in_words = rupees_in_words(grand_total)
     except (ValueError, decimal.InvalidOperation) as e:
         print(f"Warning: Could not convert amount to words: {e}")
         amount_in_words = "Amount conversion error"
     
-    ws[f'A{footer_start_row}'] = f"Total in Words: {amount_in_words} Only"
-    ws[f'I{footer_start_row}'] = float(grand_total)
+    ws.cell(row=footer_start_row, column=1, value=f"Total in Words: {amount_in_words} Only")
+    ws.cell(row=footer_start_row, column=9, value=float(grand_total))
 
     # Row 83 equivalent
-    ws[f'A{footer_start_row+1}'] = "Certified that the particulars given above are true and correct"
+    ws.cell(row=footer_start_row + 1, column=1, value="Certified that the particulars given above are true and correct")
 
     # Row 84 equivalent
-    ws[f'A{footer_start_row+2}'] = "Reasons for transportation other than by way of supply: Intrastate Stock transfer between units of same entity"
-    ws[f'E{footer_start_row+2}'] = hub_details['company_name']
+    ws.cell(row=footer_start_row + 2, column=1, value="Reasons for transportation other than by way of supply: Intrastate Stock transfer between units of same entity")
+    ws.cell(row=footer_start_row + 2, column=5, value=hub_details['company_name'])
     
     # Row 86 equivalent
-    ws[f'A{footer_start_row+4}'] = "Terms & Conditions"
+    ws.cell(row=footer_start_row + 4, column=1, value="Terms & Conditions")
     
     # Row 89 equivalent
-    ws[f'A{footer_start_row+7}'] = "Signature of Receiver"
-    ws[f'E{footer_start_row+7}'] = "Authorised signatory"
+    ws.cell(row=footer_start_row + 7, column=1, value="Signature of Receiver")
+    ws.cell(row=footer_start_row + 7, column=5, value="Authorised signatory")
 
     return product_rows_count + 1 # Include totals row for formatting
 
@@ -216,8 +206,8 @@ class VehicleDCGenerator:
     def __init__(self):
         # Initialize new sequence manager
         try:
-            from .dc_sequence_manager import dc_sequence_manager
-            self.new_sequence_manager = dc_sequence_manager
+            from .dc_sequence_manager import get_dc_sequence_manager
+            self.new_sequence_manager = get_dc_sequence_manager()
             print("✅ Initialized with new DC sequence manager")
         except ImportError as e:
             print(f"❌ Could not import new sequence manager: {e}")
@@ -349,15 +339,12 @@ class VehicleDCGenerator:
             filename = f"{ws.title}_Vehicle{vehicle_number}_{trip_refs_str}.xlsx"
             file_path = os.path.join(output_dir, filename)
             
-            wb.save(file_path)
+            save_workbook(wb, file_path)
             
             # NOTE: DC sequence already incremented atomically in reserve_dc_number()
             # No separate confirmation step needed (fixes Streamlit cache issue)
             print(f"✅ DC Excel saved with sequence number: {dc_number}")
             
-            # Clean up temporary logo files
-            cleanup_temp_files(ws)
-            
             print(f"✅ Created Vehicle DC: {dc_number} for Vehicle {vehicle_number} at {file_path}")
             
             # Initialize result structure
@@ -1879,7 +1879,8 @@ def run_settings():
                 with st.spinner("Checking sequence status..."):
                     try:
                         # Import DC sequence manager
-                        from src.core.dc_sequence_manager import dc_sequence_manager
+                        from src.core.dc_sequence_manager import get_dc_sequence_manager
+                        dc_sequence_manager = get_dc_sequence_manager()
                         
                         # Get health report
                         health_report = dc_sequence_manager.get_sequence_health_report()
@@ -1927,7 +1928,8 @@ def run_settings():
             if st.button("🧪 Generate Test DC"):
                 with st.spinner("Generating test DC..."):
                     try:
-                        from src.core.dc_sequence_manager import dc_sequence_manager
+                        from src.core.dc_sequence_manager import get_dc_sequence_manager
+                        dc_sequence_manager = get_dc_sequence_manager()
                         
                         # Generate DC
                         dc_number = dc_sequence_manager.generate_dc_number(test_company, test_facility)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Regression test for the integer-paise GST/CESS math in populate_dc_data
+Compares every amount with the original Decimal quantize(ROUND_HALF_UP) formula.
+Run from the repository root (the hub constants are loaded from data/).
+"""
+
+import os
+import random
+import sys
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from openpyxl import Workbook
+
+from src.core.dc_template_generator import _div_half_up, create_dc_template, populate_dc_data
+
+TWO_PLACES = Decimal('0.01')
+GST_RATES = [0, 2.5, 5, 12, 18, 28]
+CESS_RATES = [Decimal('0'), Decimal('0.65'), Decimal('1'), Decimal('1.5'), Decimal('12'), Decimal('17.5')]
+
+
+def decimal_amounts(value, gst_rate, cess_rate):
+    """CGST and CESS exactly as the Decimal implementation computed them"""
+    gst_rate = Decimal(str(gst_rate))
+    cgst = (value * gst_rate * Decimal('0.5') / Decimal('100')).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+    cess = (cess_rate * value / Decimal('100')).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+    return cgst, cess
+
+
+def random_products(rng, count):
+    products = []
+    for i in range(count):
+        # Zero values and exact half-paise results are the interesting cases
+        paise = 0 if rng.random() < 0.1 else rng.randint(1, 10_000_000)
+        products.append({
+            'Description': f'Product {i}',
+            'HSN': str(1000 + i),
+            'Quantity': rng.randint(1, 50),
+            'Value': Decimal(paise) / 100,
+            'GST Rate': rng.choice(GST_RATES),
+            'Cess': rng.choice(CESS_RATES),
+        })
+    return products
+
+
+def populate(products):
+    ws = Workbook().active
+    create_dc_template(ws, 13)
+    populate_dc_data(ws, {
+        'hub_type': 'AMOLAKCHAND', 'facility_name': 'Arihant', 'facility_state': 'Karnataka',
+        'hub_state': 'Karnataka', 'hub_state_code': '29', 'place_of_supply': 'Bangalore',
+        'facility_address': 'Address 560001', 'hub_address': 'Hub address 560002',
+        'serial_number': 'AKDCAH000001', 'date': datetime(2025, 1, 1),
+        'sender_name': 'Sender', 'receiver_name': 'Receiver', 'products': products,
+    })
+    return ws
+
+
+def test_div_half_up_matches_decimal():
+    rng = random.Random(12)
+    for _ in range(100_000):
+        numerator = rng.randint(-10**9, 10**9)
+        denominator = rng.choice([1, 2, 4, 20, 200, 2000, rng.randint(1, 10**6)])
+        expected = (Decimal(numerator) / Decimal(denominator)).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
+        assert _div_half_up(numerator, denominator) == int(expected), (numerator, denominator)
+
+
+def test_product_and_total_amounts_match_decimal():
+    rng = random.Random(2024)
+    for _ in range(200):
+        products = random_products(rng, rng.randint(1, 25))
+        ws = populate(products)
+
+        total_value = total_cgst = total_cess = Decimal('0')
+        for row, product in enumerate(products, 14):
+            value = product['Value']
+            cgst, cess = decimal_amounts(value, product['GST Rate'], product['Cess'])
+            assert ws.cell(row, 5).value == float(value), (row, product)
+            assert ws.cell(row, 7).value == float(cgst), (row, product)
+            assert ws.cell(row, 8).value == float(cgst), (row, product)
+            assert ws.cell(row, 9).value == float(cess), (row, product)
+            total_value += value
+            total_cgst += cgst
+            total_cess += cess
+
+        totals_row = 14 + len(products)
+        assert ws.cell(totals_row, 1).value == "Total"
+        assert ws.cell(totals_row, 5).value == float(total_value)
+        assert ws.cell(totals_row, 7).value == float(total_cgst)
+        assert ws.cell(totals_row, 8).value == float(total_cgst)
+        assert ws.cell(totals_row, 9).value == float(total_cess)
+        grand_total = (total_value + 2 * total_cgst + total_cess).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+        assert ws.cell(totals_row + 1, 9).value == float(grand_total)
+
+
+if __name__ == "__main__":
+    test_div_half_up_matches_decimal()
+    test_product_and_total_amounts_match_decimal()
+    print("✅ Paise amounts match the Decimal formula")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for LocalSequenceGenerator's append-only log
+Covers replay after a crash, recovery from a torn last line, and compaction.
+"""
+
+import atexit
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.dc_sequence_manager import LocalSequenceGenerator
+
+
+def crash(generator):
+    """Drop a generator without compacting, as if the process had been killed"""
+    atexit.unregister(generator.close)
+    if generator._log is not None:
+        generator._log.close()
+
+
+def read_snapshot(state_file):
+    with open(state_file) as f:
+        return json.load(f)
+
+
+def test_log_replayed_after_crash():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'state.json')
+        generator = LocalSequenceGenerator(state_file)
+        assert generator.get_next_sequence('akdcah_seq') == 301
+        assert generator.get_next_sequence_batch('akdcah_seq', 5) == 302
+        assert generator.get_next_sequence('bddcsg_seq') == 301
+        crash(generator)
+        assert not os.path.exists(state_file)
+
+        restarted = LocalSequenceGenerator(state_file)
+        assert restarted.get_current_sequence_value('akdcah_seq') == 306
+        assert restarted.get_current_sequence_value('bddcsg_seq') == 301
+        assert restarted.get_next_sequence('akdcah_seq') == 307
+        restarted.close()
+
+
+def test_torn_last_line_is_skipped_and_log_rewritten():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'state.json')
+        generator = LocalSequenceGenerator(state_file)
+        generator.get_next_sequence_batch('akdcah_seq', 10)
+        crash(generator)
+        with open(generator.log_file, 'a') as f:
+            f.write('{"name": "akdcah_seq", "va')
+
+        recovered = LocalSequenceGenerator(state_file)
+        assert recovered.get_current_sequence_value('akdcah_seq') == 310
+        # The torn line is compacted away, so new entries start on a clean line
+        assert read_snapshot(state_file)['akdcah_seq'] == 310
+        assert os.path.getsize(recovered.log_file) == 0
+        assert recovered.get_next_sequence('akdcah_seq') == 311
+        crash(recovered)
+
+        replayed = LocalSequenceGenerator(state_file)
+        assert replayed.get_current_sequence_value('akdcah_seq') == 311
+        replayed.close()
+
+
+def test_compaction_folds_log_into_snapshot():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'state.json')
+        generator = LocalSequenceGenerator(state_file)
+        generator.COMPACT_AFTER = 3
+        for _ in range(3):
+            generator.get_next_sequence('sbdcah_seq')
+        assert read_snapshot(state_file)['sbdcah_seq'] == 303
+        assert os.path.getsize(generator.log_file) == 0
+
+        generator.get_next_sequence('sbdcah_seq')
+        with open(generator.log_file) as f:
+            assert [json.loads(line) for line in f] == [{'name': 'sbdcah_seq', 'val': 304}]
+
+        generator.close()
+        assert generator._log is None
+        assert read_snapshot(state_file)['sbdcah_seq'] == 304
+        assert os.path.getsize(generator.log_file) == 0
+        reloaded = LocalSequenceGenerator(state_file)
+        assert reloaded.get_current_sequence_value('sbdcah_seq') == 304
+        reloaded.close()
+
+
+if __name__ == "__main__":
+    test_log_replayed_after_crash()
+    test_torn_last_line_is_skipped_and_log_rewritten()
+    test_compaction_folds_log_into_snapshot()
+    print("✅ Local sequence log tests passed")